@@ -39,6 +39,7 @@ INSTALLED_APPS = [
     # Local apps
     'users',
     'projects',
+    'timesheets',
     'leave',
     'performance',
     'reports',
@@ -137,7 +138,7 @@ AUTH_USER_MODEL = 'users.User'
 # REST Framework settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'users.authentication.CachedJWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
@@ -203,6 +204,14 @@ EMAIL_PORT = env.int('EMAIL_PORT', default=587)
 EMAIL_USE_TLS = env.bool('EMAIL_USE_TLS', default=True)
 EMAIL_HOST_USER = env('EMAIL_HOST_USER', default='')
 EMAIL_HOST_PASSWORD = env('EMAIL_HOST_PASSWORD', default='')
+DEFAULT_FROM_EMAIL = env('DEFAULT_FROM_EMAIL', default='webmaster@localhost')
+FRONTEND_URL = env('FRONTEND_URL', default='http://localhost:5173')
+
+# Email outbox (webtrack_notifications.outbox, run with manage.py send_outbox)
+OUTBOX_BATCH_SIZE = env.int('OUTBOX_BATCH_SIZE', default=100)
+OUTBOX_MAX_ATTEMPTS = env.int('OUTBOX_MAX_ATTEMPTS', default=5)
+OUTBOX_RETRY_BACKOFF = env.int('OUTBOX_RETRY_BACKOFF', default=30)
+OUTBOX_POLL_INTERVAL = env.float('OUTBOX_POLL_INTERVAL', default=5.0)
 
 # Cache settings
 CACHES = {
@@ -212,6 +221,59 @@ CACHES = {
     }
 }
 
+# Authenticated user cache (users.authentication.CachedJWTAuthentication)
+AUTH_USER_CACHE_TIMEOUT = env.int('AUTH_USER_CACHE_TIMEOUT', default=300)
+AUTH_USER_CACHE_LOCAL_SIZE = env.int('AUTH_USER_CACHE_LOCAL_SIZE', default=1024)
+AUTH_USER_CACHE_LOCAL_TIMEOUT = env.int('AUTH_USER_CACHE_LOCAL_TIMEOUT', default=30)
+# Seconds a worker may serve its local tier before rechecking the shared invalidation generation
+AUTH_USER_CACHE_LOCAL_CHECK_INTERVAL = env.int('AUTH_USER_CACHE_LOCAL_CHECK_INTERVAL', default=1)
+
+# JWT revocation list (users.revocation)
+JWT_REVOCATION_BLOOM_CAPACITY = env.int('JWT_REVOCATION_BLOOM_CAPACITY', default=10000)
+JWT_REVOCATION_BLOOM_ERROR_RATE = env.float('JWT_REVOCATION_BLOOM_ERROR_RATE', default=0.001)
+JWT_REVOCATION_SYNC_INTERVAL = env.int('JWT_REVOCATION_SYNC_INTERVAL', default=30)
+
+# User autocomplete (users.directory)
+DIRECTORY_INDEX_CHECK_INTERVAL = env.int('DIRECTORY_INDEX_CHECK_INTERVAL', default=5)
+USER_AUTOCOMPLETE_MAX_RESULTS = env.int('USER_AUTOCOMPLETE_MAX_RESULTS', default=25)
+USER_AUTOCOMPLETE_SUBSTRING_MIN_LENGTH = env.int('USER_AUTOCOMPLETE_SUBSTRING_MIN_LENGTH', default=3)
+
+# Timesheet summary cache (timesheets.summary)
+TIMESHEET_SUMMARY_CACHE_TIMEOUT = env.int('TIMESHEET_SUMMARY_CACHE_TIMEOUT', default=300)
+
+# Timesheet entry storage for new timesheets: 'rows' (TimesheetEntry per day)
+# or 'compact' (7-slot array on Timesheet); see convert_timesheet_storage
+TIMESHEET_STORAGE = env.str('TIMESHEET_STORAGE', default='rows')
+
+# Timesheet grid (timesheets.grid)
+TIMESHEET_GRID_MAX_DAYS = env.int('TIMESHEET_GRID_MAX_DAYS', default=31)
+
+# Overtime report over the daily hours ledger (timesheets.ledger)
+OVERTIME_DAILY_HOURS = env.str('OVERTIME_DAILY_HOURS', default='8')
+OVERTIME_REPORT_MAX_DAYS = env.int('OVERTIME_REPORT_MAX_DAYS', default=366)
+
+# Project list expansion (projects.views, ?expand=members,tasks)
+PROJECT_EXPAND_MAX_ITEMS = env.int('PROJECT_EXPAND_MAX_ITEMS', default=20)
+
+# Project portfolio summary cache (projects.summary)
+PROJECT_SUMMARY_CACHE_TIMEOUT = env.int('PROJECT_SUMMARY_CACHE_TIMEOUT', default=300)
+
+# Task board columns (projects.board)
+TASK_BOARD_PAGE_SIZE = env.int('TASK_BOARD_PAGE_SIZE', default=20)
+TASK_BOARD_MAX_PAGE_SIZE = env.int('TASK_BOARD_MAX_PAGE_SIZE', default=100)
+
+# Login password hashing pool (users.passwords)
+LOGIN_HASH_WORKERS = env.int('LOGIN_HASH_WORKERS', default=4)
+LOGIN_HASH_MAX_PENDING = env.int('LOGIN_HASH_MAX_PENDING', default=32)
+LOGIN_HASH_TIMEOUT = env.int('LOGIN_HASH_TIMEOUT', default=10)
+
+# Bulk user import (users.importers)
+USER_IMPORT_BATCH_SIZE = env.int('USER_IMPORT_BATCH_SIZE', default=500)
+USER_IMPORT_HASH_PROCESSES = env.int('USER_IMPORT_HASH_PROCESSES', default=None)
+
+# Per-user visibility sets (users.visibility)
+VISIBILITY_CACHE_TIMEOUT = env.int('VISIBILITY_CACHE_TIMEOUT', default=600)
+
 # Logging settings
 LOGGING = {
     'version': 1,
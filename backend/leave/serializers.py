@@ -1,6 +1,6 @@
 from rest_framework import serializers
 from .models import LeaveType, LeaveRequest, LeaveBalance, LeavePolicy
-from users.serializers import UserSerializer
+from users.serializers import UserRefSerializer
 from django.utils import timezone
 
 class LeaveTypeSerializer(serializers.ModelSerializer):
@@ -27,7 +27,7 @@ class LeaveBalanceSerializer(serializers.ModelSerializer):
         read_only_fields = ('created_at', 'updated_at')
 
 class LeaveRequestSerializer(serializers.ModelSerializer):
-    employee = UserSerializer(read_only=True)
+    employee = UserRefSerializer(read_only=True)
     employee_id = serializers.IntegerField(write_only=True)
     leave_type_name = serializers.CharField(source='leave_type.name', read_only=True)
     approved_by_name = serializers.CharField(source='approved_by.get_full_name', read_only=True)
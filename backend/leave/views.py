@@ -1,9 +1,10 @@
 from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from django.db.models import Sum
+from django.db.models import Sum, Count
 from django_filters import rest_framework as filters
 from django.utils import timezone
+from users.visibility import get_visibility
 from .models import LeaveType, LeaveRequest, LeaveBalance, LeavePolicy
 from .serializers import (
     LeaveTypeSerializer, LeaveRequestSerializer, LeaveRequestCreateSerializer,
@@ -87,10 +88,7 @@ class LeaveRequestViewSet(viewsets.ModelViewSet):
         user = self.request.user
         if user.is_admin:
             return LeaveRequest.objects.all()
-        return LeaveRequest.objects.filter(
-            models.Q(employee=user) |
-            models.Q(employee__manager=user)
-        ).distinct()
+        return LeaveRequest.objects.filter(employee_id__in=get_visibility(user).employee_ids)
 
     def get_serializer_class(self):
         if self.action == 'create':
@@ -139,10 +137,7 @@ class LeaveRequestViewSet(viewsets.ModelViewSet):
         if user.is_admin:
             queryset = LeaveRequest.objects.all()
         else:
-            queryset = LeaveRequest.objects.filter(
-                models.Q(employee=user) |
-                models.Q(employee__manager=user)
-            ).distinct()
+            queryset = LeaveRequest.objects.filter(employee_id__in=get_visibility(user).employee_ids)
 
         current_year = timezone.now().year
         summary = queryset.filter(
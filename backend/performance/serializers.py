@@ -1,6 +1,6 @@
 from rest_framework import serializers
 from .models import Skill, PerformanceReview, SkillRating, Goal
-from users.serializers import UserSerializer
+from users.serializers import UserRefSerializer
 
 class SkillSerializer(serializers.ModelSerializer):
     class Meta:
@@ -17,8 +17,8 @@ class SkillRatingSerializer(serializers.ModelSerializer):
         read_only_fields = ('created_at', 'updated_at')
 
 class PerformanceReviewSerializer(serializers.ModelSerializer):
-    employee = UserSerializer(read_only=True)
-    reviewer = UserSerializer(read_only=True)
+    employee = UserRefSerializer(read_only=True)
+    reviewer = UserRefSerializer(read_only=True)
     skill_ratings = SkillRatingSerializer(many=True, read_only=True)
     overall_rating = serializers.DecimalField(
         max_digits=3,
@@ -85,7 +85,7 @@ class PerformanceReviewUpdateSerializer(serializers.ModelSerializer):
         return instance
 
 class GoalSerializer(serializers.ModelSerializer):
-    employee = UserSerializer(read_only=True)
+    employee = UserRefSerializer(read_only=True)
 
     class Meta:
         model = Goal
@@ -3,6 +3,7 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from django.db.models import Avg
 from django_filters import rest_framework as filters
+from users.visibility import get_visibility
 from .models import Skill, PerformanceReview, SkillRating, Goal
 from .serializers import (
     SkillSerializer, PerformanceReviewSerializer, PerformanceReviewCreateSerializer,
@@ -35,12 +36,7 @@ class PerformanceReviewViewSet(viewsets.ModelViewSet):
     filterset_class = PerformanceReviewFilter
 
     def get_queryset(self):
-        user = self.request.user
-        if user.is_admin:
-            return PerformanceReview.objects.all()
-        elif user.is_manager:
-            return PerformanceReview.objects.filter(employee__manager=user)
-        return PerformanceReview.objects.filter(employee=user)
+        return get_visibility(self.request.user).filter_employees(PerformanceReview.objects.all())
 
     def get_serializer_class(self):
         if self.action == 'create':
@@ -95,13 +91,7 @@ class PerformanceReviewViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=['get'])
     def summary(self, request):
-        user = request.user
-        if user.is_admin:
-            queryset = PerformanceReview.objects.all()
-        elif user.is_manager:
-            queryset = PerformanceReview.objects.filter(employee__manager=user)
-        else:
-            queryset = PerformanceReview.objects.filter(employee=user)
+        queryset = get_visibility(request.user).filter_employees(PerformanceReview.objects.all())
 
         total_reviews = queryset.count()
         completed_reviews = queryset.filter(status=PerformanceReview.Status.COMPLETED).count()
@@ -121,12 +111,7 @@ class GoalViewSet(viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        user = self.request.user
-        if user.is_admin:
-            return Goal.objects.all()
-        elif user.is_manager:
-            return Goal.objects.filter(employee__manager=user)
-        return Goal.objects.filter(employee=user)
+        return get_visibility(self.request.user).filter_employees(Goal.objects.all())
 
     def get_serializer_class(self):
         if self.action == 'create':
@@ -0,0 +1,49 @@
+import base64
+import datetime
+import json
+from django.db.models import BooleanField, Count
+from django.db.models.expressions import RawSQL
+from .models import Project, Task
+
+# Column order, and the keyset each column is sorted and paged by
+KEYSET = ('priority_rank', 'due_date', 'id')
+
+def encode_cursor(task):
+    position = [task.priority_rank, task.due_date.isoformat(), task.pk]
+    return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+def decode_cursor(cursor):
+    try:
+        rank, due_date, pk = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return int(rank), datetime.date.fromisoformat(due_date), int(pk)
+    except (ValueError, TypeError):
+        raise ValueError('Invalid cursor.')
+
+def after(queryset, cursor):
+    """
+    Rows past cursor in keyset order, as one row-value comparison so the
+    board index is range-scanned from the cursor instead of re-reading
+    every earlier row the way an OFFSET would.
+    """
+    table = Task._meta.db_table
+    columns = ', '.join(f'"{table}"."{Task._meta.get_field(name).column}"' for name in KEYSET)
+    return queryset.filter(RawSQL(f'({columns}) > (%s, %s, %s)', decode_cursor(cursor), output_field=BooleanField()))
+
+def column_page(queryset, task_status, cursor=None, page_size=20):
+    """One page of a status column, plus the cursor of the next page if there is one."""
+    tasks = queryset.filter(status=task_status).order_by(*KEYSET)
+    if cursor:
+        tasks = after(tasks, cursor)
+    tasks = list(tasks[:page_size + 1])
+    next_cursor = encode_cursor(tasks[page_size - 1]) if len(tasks) > page_size else None
+    return tasks[:page_size], next_cursor
+
+def column_counts(queryset, project_id=None, filtered=False):
+    """Tasks per status; an unfiltered project board reads its task counters."""
+    if project_id is not None and not filtered:
+        project = Project.objects.filter(pk=project_id).first()
+        if project is not None:
+            return {status: getattr(project, Task.counter_field(status)) for status in Task.Status.values}
+    counts = dict.fromkeys(Task.Status.values, 0)
+    counts.update(queryset.order_by().values_list('status').annotate(total=Count('pk')))
+    return counts
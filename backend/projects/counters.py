@@ -0,0 +1,38 @@
+from django.db import transaction
+from django.db.models import Count, Q
+from .models import Project, Task
+
+COUNTER_FIELDS = {status: Task.counter_field(status) for status in Task.Status.values}
+
+def counted_tasks():
+    """Actual task counts by status for every project with tasks, in one grouped query."""
+    counts = {
+        field: Count('pk', filter=Q(status=status))
+        for status, field in COUNTER_FIELDS.items()
+    }
+    return {
+        row.pop('project_id'): row
+        for row in Task.objects.order_by().values('project_id').annotate(**counts)
+    }
+
+def reconcile_task_counters(dry_run=False):
+    """
+    Rewrite the counters of every project that drifted from its tasks and
+    return those projects. The project rows are locked before counting, so
+    task writes racing the repair queue behind it and apply on top of the
+    recounted values instead of being overwritten.
+    """
+    fields = list(COUNTER_FIELDS.values())
+    with transaction.atomic():
+        projects = list(Project.objects.select_for_update().order_by('pk').only('pk', 'name', *fields))
+        actual = counted_tasks()
+        drifted = []
+        for project in projects:
+            counts = actual.get(project.pk, {})
+            if any(getattr(project, field) != counts.get(field, 0) for field in fields):
+                for field in fields:
+                    setattr(project, field, counts.get(field, 0))
+                drifted.append(project)
+        if drifted and not dry_run:
+            Project.objects.bulk_update(drifted, fields, batch_size=500)
+    return drifted
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from projects.counters import reconcile_task_counters
+
+class Command(BaseCommand):
+    help = 'Recount the per-status task counters on projects and repair any that drifted.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Report drifted projects without saving.')
+
+    def handle(self, *args, **options):
+        drifted = reconcile_task_counters(dry_run=options['dry_run'])
+        for project in drifted:
+            self.stdout.write(f'project {project.pk} ({project.name}): {project.task_count} tasks, '
+                              f'{project.completed_task_count} completed')
+        verb = 'Found' if options['dry_run'] else 'Repaired'
+        self.stdout.write(self.style.SUCCESS(f'{verb} {len(drifted)} projects with drifted task counters.'))
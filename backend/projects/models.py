@@ -1,4 +1,5 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Case, F, Value, When
 from django.conf import settings
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils.translation import gettext_lazy as _
@@ -19,6 +20,11 @@ class Project(models.Model):
     status = models.CharField(max_length=20, choices=Status.choices, default=Status.PLANNING)
     budget = models.DecimalField(max_digits=12, decimal_places=2, null=True, blank=True)
     actual_cost = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    # Task counts by status, maintained by Task.save and the task post_delete signal
+    todo_task_count = models.PositiveIntegerField(default=0, editable=False)
+    in_progress_task_count = models.PositiveIntegerField(default=0, editable=False)
+    review_task_count = models.PositiveIntegerField(default=0, editable=False)
+    completed_task_count = models.PositiveIntegerField(default=0, editable=False)
     project_manager = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.SET_NULL,
@@ -28,18 +34,42 @@ class Project(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    _loaded_project_manager_id = None
+
     class Meta:
         ordering = ['-created_at']
 
     def __str__(self):
         return self.name
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_project_manager_id = instance.__dict__.get('project_manager_id')
+        return instance
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self._loaded_project_manager_id = self.project_manager_id
+
+    @property
+    def task_count(self):
+        return sum(getattr(self, Task.counter_field(status)) for status in Task.Status.values)
+
     def calculate_progress(self):
-        total_tasks = self.tasks.count()
+        total_tasks = self.task_count
         if total_tasks == 0:
             return 0
-        completed_tasks = self.tasks.filter(status=Task.Status.COMPLETED).count()
-        return (completed_tasks / total_tasks) * 100
+        return (self.completed_task_count / total_tasks) * 100
+
+def adjust_task_counters(project_id, deltas):
+    """Apply {status: delta} to a project's task counters in one UPDATE."""
+    changes = {
+        Task.counter_field(status): F(Task.counter_field(status)) + delta
+        for status, delta in deltas.items() if status and delta
+    }
+    if project_id and changes:
+        Project.objects.filter(pk=project_id).update(**changes)
 
 class Task(models.Model):
     class Status(models.TextChoices):
@@ -65,6 +95,17 @@ class Task(models.Model):
     )
     status = models.CharField(max_length=20, choices=Status.choices, default=Status.TODO)
     priority = models.CharField(max_length=20, choices=Priority.choices, default=Priority.MEDIUM)
+    # Urgent first; priority itself sorts alphabetically, so boards order and index on this
+    priority_rank = models.GeneratedField(
+        expression=Case(
+            When(priority=Priority.URGENT, then=Value(0)),
+            When(priority=Priority.HIGH, then=Value(1)),
+            When(priority=Priority.MEDIUM, then=Value(2)),
+            default=Value(3),
+        ),
+        output_field=models.SmallIntegerField(),
+        db_persist=True,
+    )
     start_date = models.DateField()
     due_date = models.DateField()
     estimated_hours = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True)
@@ -72,12 +113,45 @@ class Task(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    _loaded_project_id = None
+    _loaded_status = None
+
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Task board columns, in keyset order (projects.board)
+            models.Index(fields=['project', 'status', 'priority_rank', 'due_date', 'id']),
+            models.Index(fields=['assigned_to', 'status']),
+        ]
 
     def __str__(self):
         return f"{self.project.name} - {self.title}"
 
+    @staticmethod
+    def counter_field(status):
+        return f'{status.lower()}_task_count'
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_project_id = instance.__dict__.get('project_id')
+        instance._loaded_status = instance.__dict__.get('status')
+        return instance
+
+    def save(self, *args, **kwargs):
+        adding = self._state.adding
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if adding:
+                adjust_task_counters(self.project_id, {self.status: 1})
+            elif self.project_id != self._loaded_project_id:
+                adjust_task_counters(self._loaded_project_id, {self._loaded_status: -1})
+                adjust_task_counters(self.project_id, {self.status: 1})
+            elif self.status != self._loaded_status:
+                adjust_task_counters(self.project_id, {self._loaded_status: -1, self.status: 1})
+        self._loaded_project_id = self.project_id
+        self._loaded_status = self.status
+
 class ProjectMember(models.Model):
     class Role(models.TextChoices):
         DEVELOPER = 'DEVELOPER', _('Developer')
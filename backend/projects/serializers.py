@@ -1,9 +1,10 @@
+from django.db.models import Prefetch
 from rest_framework import serializers
 from .models import Project, Task, ProjectMember, ProjectComment, ProjectDocument
-from users.serializers import UserSerializer
+from users.serializers import UserRefSerializer
 
 class ProjectMemberSerializer(serializers.ModelSerializer):
-    user = UserSerializer(read_only=True)
+    user = UserRefSerializer(read_only=True)
 
     class Meta:
         model = ProjectMember
@@ -11,7 +12,7 @@ class ProjectMemberSerializer(serializers.ModelSerializer):
         read_only_fields = ('created_at', 'updated_at')
 
 class ProjectCommentSerializer(serializers.ModelSerializer):
-    user = UserSerializer(read_only=True)
+    user = UserRefSerializer(read_only=True)
 
     class Meta:
         model = ProjectComment
@@ -19,7 +20,7 @@ class ProjectCommentSerializer(serializers.ModelSerializer):
         read_only_fields = ('created_at', 'updated_at')
 
 class ProjectDocumentSerializer(serializers.ModelSerializer):
-    uploaded_by = UserSerializer(read_only=True)
+    uploaded_by = UserRefSerializer(read_only=True)
 
     class Meta:
         model = ProjectDocument
@@ -27,12 +28,12 @@ class ProjectDocumentSerializer(serializers.ModelSerializer):
         read_only_fields = ('created_at', 'updated_at')
 
 class TaskSerializer(serializers.ModelSerializer):
-    assigned_to = UserSerializer(read_only=True)
+    assigned_to = UserRefSerializer(read_only=True)
     assigned_to_id = serializers.IntegerField(write_only=True, required=False)
 
     class Meta:
         model = Task
-        fields = '__all__'
+        exclude = ('priority_rank',)
         read_only_fields = ('created_at', 'updated_at')
 
     def create(self, validated_data):
@@ -42,7 +43,22 @@ class TaskSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 class ProjectSerializer(serializers.ModelSerializer):
-    project_manager = UserSerializer(read_only=True)
+    """
+    Nested relations are only rendered when named in context['expand'], and
+    are then read from the lists setup_eager_loading prefetched. Without
+    that key (e.g. outside a view) every relation is included and loaded
+    through its manager.
+    """
+    # Relation name -> queryset used to prefetch it when expanded. Nested user
+    # refs are not batched across projects, so each row joins its user.
+    expandable = {
+        'members': lambda: ProjectMember.objects.select_related('user'),
+        'tasks': lambda: Task.objects.select_related('assigned_to'),
+        'comments': lambda: ProjectComment.objects.select_related('user'),
+        'documents': lambda: ProjectDocument.objects.select_related('uploaded_by'),
+    }
+
+    project_manager = UserRefSerializer(read_only=True)
     project_manager_id = serializers.IntegerField(write_only=True, required=False)
     members = ProjectMemberSerializer(many=True, read_only=True)
     tasks = TaskSerializer(many=True, read_only=True)
@@ -55,6 +71,43 @@ class ProjectSerializer(serializers.ModelSerializer):
         fields = '__all__'
         read_only_fields = ('created_at', 'updated_at', 'actual_cost')
 
+    @classmethod
+    def parse_expand(cls, value):
+        names = {name.strip() for name in value.split(',') if name.strip()}
+        unknown = names - set(cls.expandable)
+        if unknown:
+            raise serializers.ValidationError({
+                'expand': f"Unknown relation(s): {', '.join(sorted(unknown))}. "
+                          f"Choose from {', '.join(cls.expandable)}."
+            })
+        return names
+
+    @classmethod
+    def setup_eager_loading(cls, queryset, expand, limit=None):
+        """
+        Prefetch only the expanded relations, one query each. With a limit,
+        each project gets at most that many rows per relation (newest first).
+        """
+        prefetches = []
+        for name in expand:
+            related = cls.expandable[name]().order_by('-created_at')
+            if limit:
+                related = related[:limit]
+            # Sliced prefetches can only be stored on a plain attribute
+            prefetches.append(Prefetch(name, queryset=related, to_attr=f'expanded_{name}'))
+        return queryset.prefetch_related(*prefetches)
+
+    def get_fields(self):
+        fields = super().get_fields()
+        expand = self.context.get('expand')
+        if expand is not None:
+            for name in self.expandable:
+                if name in expand:
+                    fields[name].source = f'expanded_{name}'
+                else:
+                    fields.pop(name, None)
+        return fields
+
     def get_progress(self, obj):
         return obj.calculate_progress()
 
@@ -0,0 +1,14 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import Project, Task, adjust_task_counters
+from .summary import invalidate_portfolio_summaries_on_commit
+
+@receiver(post_delete, sender=Task)
+def release_task_counter(sender, instance, **kwargs):
+    # A receiver here also covers queryset and cascade deletes, which skip Task.delete
+    adjust_task_counters(instance._loaded_project_id, {instance._loaded_status: -1})
+
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+def invalidate_project_summaries(sender, instance, **kwargs):
+    invalidate_portfolio_summaries_on_commit()
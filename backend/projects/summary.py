@@ -0,0 +1,91 @@
+import hashlib
+from decimal import Decimal
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from users.visibility import get_visibility
+from .models import Project
+
+VERSION_KEY = 'projects:summary:version'
+# Response key -> status counted under it
+STATUS_TOTALS = {
+    'active_projects': Project.Status.IN_PROGRESS,
+    'completed_projects': Project.Status.COMPLETED,
+}
+
+def invalidate_portfolio_summaries():
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, 1, None)
+
+def invalidate_portfolio_summaries_on_commit():
+    transaction.on_commit(invalidate_portfolio_summaries)
+
+def _empty():
+    return {
+        'total_projects': 0,
+        **dict.fromkeys(STATUS_TOTALS, 0),
+        'total_budget': Decimal('0.00'),
+        'total_cost': Decimal('0.00'),
+    }
+
+def compute_portfolio_summary(project_ids=None):
+    """
+    Totals, per-status and per-client breakdowns from one GROUP BY client
+    query with conditional counts; the overall figures are rolled up in
+    Python. project_ids=None covers every project.
+    """
+    queryset = Project.objects.all()
+    if project_ids is not None:
+        queryset = queryset.filter(id__in=project_ids)
+    status_counts = {
+        f'status_{status}': Count('pk', filter=Q(status=status))
+        for status in Project.Status.values
+    }
+    rows = (
+        queryset.order_by()
+        .values('client')
+        .annotate(total_projects=Count('pk'), total_budget=Sum('budget'), total_cost=Sum('actual_cost'), **status_counts)
+    )
+
+    totals = _empty()
+    by_status = dict.fromkeys(Project.Status.values, 0)
+    by_client = []
+    for row in rows:
+        client = {'client': row['client'], **_empty()}
+        client['total_projects'] = row['total_projects']
+        client['total_budget'] += row['total_budget'] or 0
+        client['total_cost'] += row['total_cost'] or 0
+        for key, status in STATUS_TOTALS.items():
+            client[key] = row[f'status_{status}']
+        for status in Project.Status.values:
+            by_status[status] += row[f'status_{status}']
+        for key, value in client.items():
+            if key != 'client':
+                totals[key] += value
+        by_client.append(client)
+
+    return {
+        **totals,
+        'by_status': by_status,
+        'by_client': sorted(by_client, key=lambda client: client['client']),
+    }
+
+def get_portfolio_summary(user):
+    """
+    compute_portfolio_summary for the projects user can see, cached per
+    visibility scope: admins share one entry, and so do users who see the
+    same set of projects. Any project save or delete starts a new version.
+    """
+    project_ids = None if user.is_admin else get_visibility(user).project_ids
+    scope = 'all' if project_ids is None else hashlib.md5(
+        ','.join(map(str, project_ids)).encode()
+    ).hexdigest()
+    key = f'projects:summary:{cache.get_or_set(VERSION_KEY, 1, None)}:{scope}'
+    summary = cache.get(key)
+    if summary is None:
+        summary = compute_portfolio_summary(project_ids)
+        cache.set(key, summary, getattr(settings, 'PROJECT_SUMMARY_CACHE_TIMEOUT', 300))
+    return summary
@@ -0,0 +1,71 @@
+import datetime
+from django.test import TestCase, override_settings
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.test import APIRequestFactory, force_authenticate
+from users.models import User
+from .models import Project, Task, ProjectMember, ProjectComment, ProjectDocument
+from .views import ProjectViewSet
+
+START = datetime.date(2024, 1, 1)
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+class SizedPagination(PageNumberPagination):
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class ProjectListQueryCountTests(TestCase):
+    """Slim and expanded project lists cost the same queries at every page size."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user('admin', 'admin@example.com', 'x', role='ADMIN', is_staff=True)
+        # Every nested row belongs to a different user, so per-row user loads would show
+        for i in range(10):
+            project = Project.objects.create(name=f'Project {i}', client='Client', start_date=START,
+                                             project_manager=cls.admin)
+            users = [User.objects.create_user(f'user-{i}-{j}', f'user-{i}-{j}@example.com', 'x') for j in range(2)]
+            ProjectMember.objects.bulk_create([
+                ProjectMember(project=project, user=user, role=ProjectMember.Role.DEVELOPER, start_date=START)
+                for user in users
+            ])
+            for j, user in enumerate(users):
+                Task.objects.create(project=project, title=f'Task {j}', assigned_to=user, start_date=START,
+                                    due_date=START)
+            ProjectComment.objects.bulk_create([
+                ProjectComment(project=project, user=user, content='comment') for user in users
+            ])
+            ProjectDocument.objects.bulk_create([
+                ProjectDocument(project=project, title='document', file='project_documents/document.txt',
+                                uploaded_by=user)
+                for user in users
+            ])
+
+    def list_page(self, page_size, queries, expand=None):
+        params = {'page_size': page_size}
+        if expand:
+            params['expand'] = expand
+        request = APIRequestFactory().get('/api/projects/', params)
+        force_authenticate(request, self.admin)
+        view = ProjectViewSet.as_view({'get': 'list'}, pagination_class=SizedPagination)
+        with self.assertNumQueries(queries):
+            response = view(request)
+            response.render()
+        return response.data['results']
+
+    def test_slim_list(self):
+        for page_size in (5, 10):
+            with self.subTest(page_size=page_size):
+                # count, page, project managers in one batch
+                results = self.list_page(page_size, 3)
+                self.assertEqual(len(results), page_size)
+                self.assertNotIn('members', results[0])
+
+    def test_expanded_list(self):
+        for page_size in (5, 10):
+            with self.subTest(page_size=page_size):
+                # count, page, project managers, then one prefetch per relation with its users joined
+                results = self.list_page(page_size, 7, expand='members,tasks,comments,documents')
+                self.assertEqual(len(results), page_size)
+                self.assertTrue(all(len(project['members']) == 2 for project in results))
+                self.assertTrue(all(project['tasks'][0]['assigned_to'] for project in results))
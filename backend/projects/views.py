@@ -1,8 +1,10 @@
 from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from django.db.models import Sum, Count
+from django.conf import settings
+from django.db.models import Q
 from django_filters import rest_framework as filters
+from users.visibility import get_visibility
 from .models import Project, Task, ProjectMember, ProjectComment, ProjectDocument
 from .serializers import (
     ProjectSerializer, ProjectCreateSerializer, ProjectUpdateSerializer,
@@ -10,6 +12,8 @@ from .serializers import (
     ProjectCommentSerializer, ProjectCommentCreateSerializer,
     ProjectDocumentSerializer, ProjectDocumentCreateSerializer
 )
+from .board import column_counts, column_page
+from .summary import get_portfolio_summary
 
 class ProjectFilter(filters.FilterSet):
     start_date = filters.DateFilter(field_name='start_date', lookup_expr='gte')
@@ -21,6 +25,14 @@ class ProjectFilter(filters.FilterSet):
         model = Project
         fields = ['status', 'client', 'start_date', 'end_date', 'project_manager']
 
+class TaskFilter(filters.FilterSet):
+    status = filters.ChoiceFilter(choices=Task.Status.choices)
+    priority = filters.ChoiceFilter(choices=Task.Priority.choices)
+
+    class Meta:
+        model = Task
+        fields = ['project', 'status', 'priority', 'assigned_to']
+
 class ProjectViewSet(viewsets.ModelViewSet):
     queryset = Project.objects.all()
     serializer_class = ProjectSerializer
@@ -30,11 +42,29 @@ class ProjectViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         user = self.request.user
         if user.is_admin:
-            return Project.objects.all()
-        return Project.objects.filter(
-            models.Q(project_manager=user) |
-            models.Q(members__user=user)
-        ).distinct()
+            queryset = Project.objects.all()
+        else:
+            queryset = Project.objects.filter(id__in=get_visibility(user).project_ids)
+        if self.action == 'list':
+            queryset = ProjectSerializer.setup_eager_loading(
+                queryset, self.get_expand(), limit=settings.PROJECT_EXPAND_MAX_ITEMS
+            )
+        elif self.action == 'retrieve':
+            queryset = ProjectSerializer.setup_eager_loading(queryset, self.get_expand())
+        return queryset
+
+    def get_expand(self):
+        # Lists are slim unless ?expand= names relations; a single project keeps its full detail
+        value = self.request.query_params.get('expand')
+        if value is None:
+            return set() if self.action == 'list' else set(ProjectSerializer.expandable)
+        return ProjectSerializer.parse_expand(value)
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.action in ['list', 'retrieve']:
+            context['expand'] = self.get_expand()
+        return context
 
     def get_serializer_class(self):
         if self.action == 'create':
@@ -77,43 +107,22 @@ class ProjectViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=['get'])
     def summary(self, request):
-        user = request.user
-        if user.is_admin:
-            queryset = Project.objects.all()
-        else:
-            queryset = Project.objects.filter(
-                models.Q(project_manager=user) |
-                models.Q(members__user=user)
-            ).distinct()
-
-        total_projects = queryset.count()
-        active_projects = queryset.filter(status=Project.Status.IN_PROGRESS).count()
-        completed_projects = queryset.filter(status=Project.Status.COMPLETED).count()
-        total_budget = queryset.aggregate(total=Sum('budget'))['total'] or 0
-        total_cost = queryset.aggregate(total=Sum('actual_cost'))['total'] or 0
-
-        return Response({
-            'total_projects': total_projects,
-            'active_projects': active_projects,
-            'completed_projects': completed_projects,
-            'total_budget': total_budget,
-            'total_cost': total_cost,
-        })
+        return Response(get_portfolio_summary(request.user))
 
 class TaskViewSet(viewsets.ModelViewSet):
     queryset = Task.objects.all()
     serializer_class = TaskSerializer
     permission_classes = [permissions.IsAuthenticated]
+    filterset_class = TaskFilter
 
     def get_queryset(self):
         user = self.request.user
         if user.is_admin:
             return Task.objects.all()
         return Task.objects.filter(
-            models.Q(project__project_manager=user) |
-            models.Q(project__members__user=user) |
-            models.Q(assigned_to=user)
-        ).distinct()
+            Q(project_id__in=get_visibility(user).project_ids) |
+            Q(assigned_to=user)
+        )
 
     def get_permissions(self):
         if self.action in ['create', 'update', 'partial_update', 'destroy']:
@@ -160,6 +169,55 @@ class TaskViewSet(viewsets.ModelViewSet):
         task.save()
         return Response(self.get_serializer(task).data)
 
+    @action(detail=False, methods=['get'])
+    def board(self, request):
+        """
+        Kanban columns of a project's (or an assignee's) tasks, urgent and
+        soonest due first. Each column is keyset-paginated: pass a column's
+        next_cursor back with ?status= to load its next page.
+        """
+        params = request.query_params
+        project_id = params.get('project')
+        if not project_id and not params.get('assigned_to'):
+            return Response({'error': 'A project or assigned_to filter is required.'}, status=status.HTTP_400_BAD_REQUEST)
+        cursor = params.get('cursor')
+        if cursor and not params.get('status'):
+            return Response({'error': 'A cursor applies to one status column.'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            page_size = min(int(params.get('page_size', settings.TASK_BOARD_PAGE_SIZE)), settings.TASK_BOARD_MAX_PAGE_SIZE)
+            if page_size < 1:
+                raise ValueError
+        except ValueError:
+            return Response({'error': 'Page size must be a positive number.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        tasks = self.filter_queryset(self.get_queryset())
+        statuses = [params['status']] if params.get('status') else Task.Status.values
+        # Project counters hold every task, so only use them when nothing narrows the board
+        narrowed = any(params.get(name) for name in ('assigned_to', 'priority')) or not (
+            request.user.is_admin or int(project_id) in get_visibility(request.user).project_ids
+        )
+        counts = column_counts(tasks, project_id, filtered=narrowed)
+
+        pages = []
+        try:
+            for task_status in statuses:
+                pages.append((task_status,) + column_page(tasks, task_status, cursor, page_size))
+        except ValueError as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        # One serializer pass over every column loads all assignees in a single query
+        data = iter(self.get_serializer([task for _, page, _ in pages for task in page], many=True).data)
+        return Response({'columns': [
+            {
+                'status': task_status,
+                'label': Task.Status(task_status).label,
+                'count': counts[task_status],
+                'next_cursor': next_cursor,
+                'results': [next(data) for _ in page],
+            }
+            for task_status, page, next_cursor in pages
+        ]})
+
 class ProjectMemberViewSet(viewsets.ModelViewSet):
     queryset = ProjectMember.objects.all()
     serializer_class = ProjectMemberSerializer
@@ -170,9 +228,9 @@ class ProjectMemberViewSet(viewsets.ModelViewSet):
         if user.is_admin:
             return ProjectMember.objects.all()
         return ProjectMember.objects.filter(
-            models.Q(project__project_manager=user) |
-            models.Q(user=user)
-        ).distinct()
+            Q(project_id__in=get_visibility(user).managed_project_ids) |
+            Q(user=user)
+        )
 
     def get_serializer_class(self):
         if self.action == 'create':
@@ -1,9 +1,9 @@
 from rest_framework import serializers
 from .models import Report, ReportTemplate, ReportExecution, Dashboard, DashboardWidget
-from users.serializers import UserSerializer
+from users.serializers import UserRefSerializer
 
 class ReportSerializer(serializers.ModelSerializer):
-    created_by = UserSerializer(read_only=True)
+    created_by = UserRefSerializer(read_only=True)
     created_by_id = serializers.IntegerField(write_only=True)
     last_execution = serializers.SerializerMethodField()
 
@@ -30,7 +30,7 @@ class ReportSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 class ReportTemplateSerializer(serializers.ModelSerializer):
-    created_by = UserSerializer(read_only=True)
+    created_by = UserRefSerializer(read_only=True)
     created_by_id = serializers.IntegerField(write_only=True)
 
     class Meta:
@@ -45,7 +45,7 @@ class ReportTemplateSerializer(serializers.ModelSerializer):
 
 class ReportExecutionSerializer(serializers.ModelSerializer):
     report_name = serializers.CharField(source='report.name', read_only=True)
-    created_by = UserSerializer(read_only=True)
+    created_by = UserRefSerializer(read_only=True)
     created_by_id = serializers.IntegerField(write_only=True)
     result_file_url = serializers.SerializerMethodField()
 
@@ -69,7 +69,7 @@ class DashboardWidgetSerializer(serializers.ModelSerializer):
         read_only_fields = ('created_at', 'updated_at')
 
 class DashboardSerializer(serializers.ModelSerializer):
-    created_by = UserSerializer(read_only=True)
+    created_by = UserRefSerializer(read_only=True)
     created_by_id = serializers.IntegerField(write_only=True)
     widgets = DashboardWidgetSerializer(many=True, read_only=True)
 
@@ -0,0 +1,41 @@
+import os
+import sys
+import time
+import django
+
+# Set up Django environment
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+django.setup()
+
+from django.db.models import Q
+from users.directory import SEARCH_FIELDS, autocomplete, directory
+from users.models import User
+
+def legacy_search(query, limit):
+    condition = Q()
+    for field in SEARCH_FIELDS:
+        condition |= Q(**{f'{field}__icontains': query})
+    return list(User.objects.filter(condition).values('id')[:limit])
+
+def timed(func, query, limit, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        count = len(func(query, limit))
+    return count, (time.perf_counter() - start) / repeat * 1000
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        print('Usage: python scripts/benchmark_autocomplete.py <query> [<query> ...]')
+        sys.exit(1)
+
+    start = time.perf_counter()
+    directory.snapshot()
+    print(f'index built for {User.objects.filter(is_active=True).count()} active users '
+          f'in {(time.perf_counter() - start) * 1000:.0f} ms')
+
+    for query in sys.argv[1:]:
+        before_count, before_ms = timed(legacy_search, query, 10, 20)
+        after_count, after_ms = timed(autocomplete, query, 10, 200)
+        print(f'{query!r}: icontains {before_count} rows in {before_ms:.2f} ms -> '
+              f'autocomplete {after_count} rows in {after_ms:.3f} ms')
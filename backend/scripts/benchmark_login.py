@@ -0,0 +1,63 @@
+import os
+import sys
+import time
+import django
+from concurrent.futures import ThreadPoolExecutor
+
+# Set up Django environment
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+django.setup()
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from users.models import User
+
+USERNAME = 'benchmark_login_user'
+PASSWORD = 'Bench-login-pass-1'
+
+def login(client):
+    response = client.post('/api/token/', {'username': USERNAME, 'password': PASSWORD}, format='json')
+    assert response.status_code == 200, response.content
+    return response
+
+def run_sequential(count):
+    client = APIClient(SERVER_NAME='localhost')
+    with CaptureQueriesContext(connection) as queries:
+        start = time.perf_counter()
+        for _ in range(count):
+            login(client)
+        elapsed = time.perf_counter() - start
+    return elapsed, len(queries) / count
+
+def run_concurrent(count, threads):
+    def worker(_):
+        try:
+            login(APIClient(SERVER_NAME='localhost'))
+        finally:
+            connection.close()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(worker, range(count)))
+    return time.perf_counter() - start
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    threads = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+
+    user, _ = User.objects.get_or_create(username=USERNAME, defaults={'email': 'benchmark@example.com'})
+    user.set_password(PASSWORD)
+    user.save()
+
+    try:
+        elapsed, queries = run_sequential(count)
+        print(f'Sequential: {count} logins in {elapsed:.2f}s '
+              f'({count / elapsed:.1f} logins/s, {queries:.1f} queries/login)')
+
+        elapsed = run_concurrent(count, threads)
+        print(f'Concurrent ({threads} threads): {count} logins in {elapsed:.2f}s '
+              f'({count / elapsed:.1f} logins/s)')
+    finally:
+        user.delete()
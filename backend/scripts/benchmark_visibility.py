@@ -0,0 +1,64 @@
+import os
+import sys
+import time
+import django
+
+# Set up Django environment
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+django.setup()
+
+from django.db.models import Q
+from leave.models import LeaveRequest
+from projects.models import Project, Task, ProjectMember
+from users.models import User
+from users.visibility import get_visibility
+
+def legacy_querysets(user):
+    return {
+        'projects': Project.objects.filter(Q(project_manager=user) | Q(members__user=user)).distinct(),
+        'tasks': Task.objects.filter(
+            Q(project__project_manager=user) | Q(project__members__user=user) | Q(assigned_to=user)
+        ).distinct(),
+        'members': ProjectMember.objects.filter(Q(project__project_manager=user) | Q(user=user)).distinct(),
+        'leave_requests': LeaveRequest.objects.filter(
+            Q(employee=user) | Q(employee__reporting_ancestors__ancestor=user)
+        ).distinct(),
+    }
+
+def visibility_querysets(user):
+    visibility = get_visibility(user)
+    return {
+        'projects': Project.objects.filter(id__in=visibility.project_ids),
+        'tasks': Task.objects.filter(Q(project_id__in=visibility.project_ids) | Q(assigned_to=user)),
+        'members': ProjectMember.objects.filter(
+            Q(project_id__in=visibility.managed_project_ids) | Q(user=user)
+        ),
+        'leave_requests': LeaveRequest.objects.filter(employee_id__in=visibility.employee_ids),
+    }
+
+def timed_count(queryset, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        count = queryset.count()
+    return count, (time.perf_counter() - start) / repeat * 1000
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        print('Usage: python scripts/benchmark_visibility.py <username> [repeat]')
+        sys.exit(1)
+
+    user = User.objects.get(username=sys.argv[1])
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    before = legacy_querysets(user)
+    after = visibility_querysets(user)
+
+    for name in before:
+        before_count, before_ms = timed_count(before[name], repeat)
+        after_count, after_ms = timed_count(after[name], repeat)
+        print(f'== {name}: {before_count} rows in {before_ms:.2f} ms -> {after_count} rows in {after_ms:.2f} ms')
+        print('-- before')
+        print(before[name].explain())
+        print('-- after')
+        print(after[name].explain())
+        print()
@@ -1,12 +1,5 @@
 from django.contrib import admin
-from .models import Project, Timesheet, TimesheetEntry
-
-@admin.register(Project)
-class ProjectAdmin(admin.ModelAdmin):
-    list_display = ('name', 'client', 'start_date', 'end_date', 'status', 'created_at')
-    list_filter = ('status', 'client', 'start_date', 'end_date')
-    search_fields = ('name', 'client', 'description')
-    ordering = ('-created_at',)
+from .models import HourlyRate, Timesheet, TimesheetEntry
 
 class TimesheetEntryInline(admin.TabularInline):
     model = TimesheetEntry
@@ -24,3 +17,10 @@ class TimesheetAdmin(admin.ModelAdmin):
 
     def get_queryset(self, request):
         return super().get_queryset(request).select_related('employee', 'project', 'approved_by')
+
+@admin.register(HourlyRate)
+class HourlyRateAdmin(admin.ModelAdmin):
+    list_display = ('employee', 'effective_from', 'rate', 'updated_at')
+    list_filter = ('effective_from',)
+    search_fields = ('employee__username', 'employee__first_name', 'employee__last_name')
+    ordering = ('employee', '-effective_from')
@@ -0,0 +1,68 @@
+from django.db import connection, transaction
+from django.utils import timezone
+from .ledger import apply_daily_hours, timesheet_deltas
+from .models import Timesheet, TimesheetEntry
+
+COPY_WEEK_SQL = """
+WITH created AS (
+    INSERT INTO {timesheet} (employee_id, project_id, week_start_date, status, total_hours, notes,
+                             daily_hours, daily_notes, created_at, updated_at)
+    SELECT employee_id, project_id, %(target)s, %(status)s, total_hours, '',
+           daily_hours, daily_notes, %(now)s, %(now)s
+    FROM {timesheet}
+    WHERE week_start_date = %(source)s AND employee_id = ANY(%(employees)s) {project_filter}
+    ON CONFLICT (employee_id, project_id, week_start_date) DO NOTHING
+    RETURNING id, employee_id, project_id
+), copied AS (
+    INSERT INTO {entry} (timesheet_id, date, hours, description, created_at, updated_at)
+    SELECT created.id, entry.date + %(offset)s, entry.hours, entry.description, %(now)s, %(now)s
+    FROM created
+    JOIN {timesheet} source ON source.employee_id = created.employee_id
+        AND source.project_id = created.project_id AND source.week_start_date = %(source)s
+    JOIN {entry} entry ON entry.timesheet_id = source.id
+    RETURNING timesheet_id
+)
+SELECT id, employee_id, project_id, (SELECT COUNT(*) FROM copied WHERE copied.timesheet_id = created.id)
+FROM created
+ORDER BY employee_id, project_id
+"""
+
+def copy_week(source_week, target_week, employee_ids, project_id=None):
+    """
+    Clone the employees' timesheets for source_week, with their entries
+    shifted by the same number of days, into DRAFT timesheets for
+    target_week. One INSERT ... SELECT statement does the whole team;
+    timesheets that already exist in the target week are left alone.
+    Compact timesheets carry their arrays over and have no entry rows.
+    Raises ValidationError, copying nothing, if a day would pass the cap.
+    """
+    params = {
+        'source': source_week,
+        'target': target_week,
+        'offset': (target_week - source_week).days,
+        'employees': list(employee_ids),
+        'status': Timesheet.Status.DRAFT,
+        'now': timezone.now(),
+    }
+    project_filter = ''
+    if project_id is not None:
+        project_filter = 'AND project_id = %(project)s'
+        params['project'] = project_id
+    sql = COPY_WEEK_SQL.format(
+        timesheet=connection.ops.quote_name(Timesheet._meta.db_table),
+        entry=connection.ops.quote_name(TimesheetEntry._meta.db_table),
+        project_filter=project_filter,
+    )
+
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+        apply_daily_hours(timesheet_deltas([row[0] for row in rows]))
+
+    from .summary import invalidate_summaries_on_commit
+    invalidate_summaries_on_commit({employee_id for _, employee_id, _, _ in rows})
+    return [
+        {'id': pk, 'employee': employee_id, 'project': project, 'entries': entries}
+        for pk, employee_id, project, entries in rows
+    ]
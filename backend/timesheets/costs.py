@@ -0,0 +1,143 @@
+import datetime
+from bisect import bisect_right
+from collections import defaultdict
+from contextlib import contextmanager
+from decimal import Decimal
+from itertools import islice
+from django.db import transaction
+from django.db.models import F
+from projects.models import Project
+from projects.summary import invalidate_portfolio_summaries_on_commit
+from .models import HourlyRate, Timesheet, TimesheetEntry
+
+CENT = Decimal('0.01')
+
+def load_rates(employee_ids):
+    """{employee_id: (effective dates, rates)}, both ascending, for rate_on."""
+    rates = {}
+    rows = HourlyRate.objects.filter(employee_id__in=employee_ids).order_by('employee_id', 'effective_from')
+    for employee_id, effective_from, rate in rows.values_list('employee_id', 'effective_from', 'rate'):
+        dates, values = rates.setdefault(employee_id, ([], []))
+        dates.append(effective_from)
+        values.append(rate)
+    return rates
+
+def rate_on(rates, employee_id, date):
+    """The rate in effect on date; hours before an employee's first rate cost nothing."""
+    dates, values = rates.get(employee_id, ((), ()))
+    position = bisect_right(dates, date)
+    return values[position - 1] if position else Decimal('0')
+
+def day_cost(hours, rate):
+    # Costed per employee day, so incremental deltas and rebuilds round identically
+    return (hours * rate).quantize(CENT)
+
+def logged_hours(timesheets, since=None):
+    """(project_id, employee_id, date, hours) of the given timesheets, from both entry storage modes."""
+    entries = TimesheetEntry.objects.filter(timesheet__in=timesheets.order_by().values('pk'))
+    if since is not None:
+        entries = entries.filter(date__gte=since)
+    yield from entries.order_by().values_list('timesheet__project_id', 'timesheet__employee_id', 'date', 'hours')
+
+    compact = timesheets.filter(daily_hours__isnull=False)
+    if since is not None:
+        compact = compact.filter(week_start_date__gte=since - datetime.timedelta(days=6))
+    rows = compact.order_by().values_list('project_id', 'employee_id', 'week_start_date', 'daily_hours')
+    for project_id, employee_id, week_start_date, daily_hours in rows:
+        for day, hours in enumerate(daily_hours):
+            date = week_start_date + datetime.timedelta(days=day)
+            if hours and (since is None or date >= since):
+                yield project_id, employee_id, date, hours
+
+def apply_project_costs(costs):
+    """Add {project_id: cost} to Project.actual_cost, one F() UPDATE per project."""
+    # Sorted so concurrent writers take project row locks in the same order
+    changes = sorted((project_id, cost) for project_id, cost in costs.items() if cost)
+    for project_id, cost in changes:
+        Project.objects.filter(pk=project_id).update(actual_cost=F('actual_cost') + cost)
+    if changes:
+        invalidate_portfolio_summaries_on_commit()
+
+def apply_timesheet_costs(timesheet_ids, sign=1):
+    """Add (sign=1) or remove (sign=-1) the cost of whole timesheets as they enter or leave APPROVED."""
+    rows = list(logged_hours(Timesheet.objects.filter(pk__in=timesheet_ids)))
+    rates = load_rates({employee_id for _, employee_id, _, _ in rows})
+    costs = defaultdict(Decimal)
+    for project_id, employee_id, date, hours in rows:
+        costs[project_id] += sign * day_cost(hours, rate_on(rates, employee_id, date))
+    apply_project_costs(costs)
+
+def apply_day_costs(timesheet, before, after):
+    """Cost an edit of an approved timesheet, given its {date: hours} before and after."""
+    if timesheet.status != Timesheet.Status.APPROVED or before == after:
+        return
+    rates = load_rates([timesheet.employee_id])
+    cost = Decimal('0')
+    for date in before.keys() | after.keys():
+        rate = rate_on(rates, timesheet.employee_id, date)
+        cost += day_cost(after.get(date, Decimal('0')), rate) - day_cost(before.get(date, Decimal('0')), rate)
+    apply_project_costs({timesheet.project_id: cost})
+
+@contextmanager
+def reprice_approved_hours(since):
+    """
+    Wrap a rate table write: approved hours of each {employee_id: first
+    affected date} are costed under the rates before and after the write,
+    and the difference is applied to their projects.
+    """
+    approved = Timesheet.objects.filter(status=Timesheet.Status.APPROVED)
+    rows = []
+    for employee_id, date in since.items():
+        rows.extend(logged_hours(approved.filter(employee_id=employee_id), since=date))
+    old_rates = load_rates(since)
+    yield
+    new_rates = load_rates(since)
+    costs = defaultdict(Decimal)
+    for project_id, employee_id, date, hours in rows:
+        costs[project_id] += (
+            day_cost(hours, rate_on(new_rates, employee_id, date))
+            - day_cost(hours, rate_on(old_rates, employee_id, date))
+        )
+    apply_project_costs(costs)
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+def rebuild_project_costs(chunk_size=500, dry_run=False):
+    """
+    Recompute every project's actual_cost from approved hours and return
+    the [(project, old cost)] that changed. Approved timesheet ids are
+    streamed from a server-side cursor and costed a chunk at a time, so
+    memory holds one chunk plus a running total per project. Project rows
+    are locked first; approvals racing the rebuild wait and then apply on
+    top of the recomputed totals.
+    """
+    with transaction.atomic():
+        projects = list(Project.objects.select_for_update().order_by('pk').only('pk', 'name', 'actual_cost'))
+        approved = Timesheet.objects.filter(status=Timesheet.Status.APPROVED).order_by().values_list('pk', flat=True)
+        totals = defaultdict(Decimal)
+        rates = {}
+        for chunk in _chunks(approved.iterator(chunk_size=chunk_size), chunk_size):
+            rows = list(logged_hours(Timesheet.objects.filter(pk__in=chunk)))
+            missing = {employee_id for _, employee_id, _, _ in rows} - rates.keys()
+            if missing:
+                rates.update(dict.fromkeys(missing, ((), ())))
+                rates.update(load_rates(missing))
+            for project_id, employee_id, date, hours in rows:
+                totals[project_id] += day_cost(hours, rate_on(rates, employee_id, date))
+
+        changed = []
+        for project in projects:
+            cost = totals.get(project.pk, Decimal('0'))
+            if project.actual_cost != cost:
+                changed.append((project, project.actual_cost))
+                project.actual_cost = cost
+        if changed and not dry_run:
+            Project.objects.bulk_update([project for project, _ in changed], ['actual_cost'], batch_size=500)
+            invalidate_portfolio_summaries_on_commit()
+    return changed
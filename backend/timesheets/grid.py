@@ -0,0 +1,67 @@
+import datetime
+from decimal import Decimal
+from .models import DAILY_HOURS_LIMIT, Project, TimesheetEntry
+
+def grid_rows(timesheets, start_date, end_date):
+    """(employee_id, date, project_id, hours) for the range, from both entry storage modes."""
+    yield from TimesheetEntry.objects.filter(
+        timesheet__in=timesheets.order_by().values('pk'), date__range=(start_date, end_date)
+    ).order_by().values_list('timesheet__employee_id', 'date', 'timesheet__project_id', 'hours')
+
+    compact = timesheets.filter(
+        daily_hours__isnull=False,
+        week_start_date__range=(start_date - datetime.timedelta(days=6), end_date),
+    ).order_by().values_list('employee_id', 'week_start_date', 'project_id', 'daily_hours')
+    for employee_id, week_start_date, project_id, daily_hours in compact:
+        for day, hours in enumerate(daily_hours):
+            date = week_start_date + datetime.timedelta(days=day)
+            if hours and start_date <= date <= end_date:
+                yield employee_id, date, project_id, hours
+
+def build_grid(timesheets, start_date, end_date, ref_map):
+    """
+    Pivot the timesheet hours of a date range into an employee x day x project grid.
+    Rows come back from the database as flat tuples and are placed by index
+    in one pass, which also accumulates per-employee and per-day totals.
+    Cells are returned as sparse parallel columns (employee, day, project,
+    hours) indexing into the employees/days/projects axes.
+    """
+    day_count = (end_date - start_date).days + 1
+    rows = grid_rows(timesheets, start_date, end_date)
+
+    employee_index = {}
+    project_index = {}
+    columns = {'employee': [], 'day': [], 'project': [], 'hours': []}
+    daily = []
+    for employee_id, date, project_id, hours in rows:
+        row = employee_index.get(employee_id)
+        if row is None:
+            row = employee_index[employee_id] = len(employee_index)
+            daily.append([Decimal('0')] * day_count)
+        column = project_index.get(project_id)
+        if column is None:
+            column = project_index[project_id] = len(project_index)
+        day = (date - start_date).days
+
+        columns['employee'].append(row)
+        columns['day'].append(day)
+        columns['project'].append(column)
+        columns['hours'].append(float(hours))
+        daily[row][day] += hours
+
+    ref_map.load(employee_index)
+    project_names = dict(Project.objects.filter(pk__in=project_index).values_list('id', 'name'))
+
+    return {
+        'start_date': start_date,
+        'end_date': end_date,
+        'days': [start_date + datetime.timedelta(days=day) for day in range(day_count)],
+        'employees': [ref_map.get(employee_id) for employee_id in employee_index],
+        'projects': [{'id': project_id, 'name': project_names.get(project_id)} for project_id in project_index],
+        'cells': columns,
+        'daily_hours': [[float(hours) for hours in days] for days in daily],
+        'employee_totals': [float(sum(days)) for days in daily],
+        'over_limit': [
+            [row, day] for row, days in enumerate(daily) for day, hours in enumerate(days) if hours > DAILY_HOURS_LIMIT
+        ],
+    }
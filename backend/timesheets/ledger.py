@@ -0,0 +1,110 @@
+import datetime
+from collections import defaultdict
+from decimal import Decimal
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, connection, transaction
+from .models import DAILY_HOURS_LIMIT, DailyHours, Timesheet, TimesheetEntry
+
+UPSERT_SQL = """
+INSERT INTO {table} (employee_id, date, hours) VALUES {values}
+ON CONFLICT (employee_id, date) DO UPDATE SET hours = {table}.hours + EXCLUDED.hours
+"""
+
+LOGGED_SQL = """
+SELECT employee_id, date, SUM(hours) AS hours FROM (
+    SELECT timesheet.employee_id, entry.date, entry.hours
+    FROM {entry} entry JOIN {timesheet} timesheet ON timesheet.id = entry.timesheet_id
+    UNION ALL
+    SELECT timesheet.employee_id, timesheet.week_start_date + (day.position - 1)::integer, day.hours
+    FROM {timesheet} timesheet CROSS JOIN LATERAL unnest(timesheet.daily_hours) WITH ORDINALITY AS day(hours, position)
+    WHERE timesheet.daily_hours IS NOT NULL AND day.hours <> 0
+) logged
+GROUP BY employee_id, date
+"""
+
+def day_deltas(employee_id, before, after):
+    """{(employee_id, date): change} between two {date: hours} maps, without zero changes."""
+    deltas = {}
+    for date in before.keys() | after.keys():
+        delta = after.get(date, Decimal('0')) - before.get(date, Decimal('0'))
+        if delta:
+            deltas[(employee_id, date)] = delta
+    return deltas
+
+def timesheet_deltas(timesheet_ids, sign=1):
+    """
+    Ledger changes for adding (sign=1) or removing (sign=-1) whole
+    timesheets, read from the database for either storage mode.
+    """
+    deltas = defaultdict(Decimal)
+    rows = TimesheetEntry.objects.filter(timesheet_id__in=timesheet_ids).values_list(
+        'timesheet__employee_id', 'date', 'hours'
+    )
+    for employee_id, date, hours in rows:
+        deltas[(employee_id, date)] += sign * hours
+
+    compact = Timesheet.objects.filter(pk__in=timesheet_ids, daily_hours__isnull=False).values_list(
+        'employee_id', 'week_start_date', 'daily_hours'
+    )
+    for employee_id, week_start_date, daily_hours in compact:
+        for day, hours in enumerate(daily_hours):
+            deltas[(employee_id, week_start_date + datetime.timedelta(days=day))] += sign * hours
+    return {key: delta for key, delta in deltas.items() if delta}
+
+def _over_limit_message(dates):
+    days = ', '.join(f'{date:%Y-%m-%d}' for date in sorted(dates))
+    return f'Total hours across projects cannot exceed {DAILY_HOURS_LIMIT} per day (exceeded on {days}).'
+
+def apply_daily_hours(deltas):
+    """
+    Add deltas to the ledger with one upsert. Days that would pass the cap
+    are reported from a single keyed read first; the check constraint
+    catches anything that races past it. Raises ValidationError either way.
+    """
+    if not deltas:
+        return
+
+    increases = {key: delta for key, delta in deltas.items() if delta > 0}
+    if increases:
+        current = {
+            (employee_id, date): hours
+            for employee_id, date, hours in DailyHours.objects.filter(
+                employee_id__in={employee_id for employee_id, _ in increases},
+                date__in={date for _, date in increases},
+            ).values_list('employee_id', 'date', 'hours')
+        }
+        over = [key[1] for key, delta in increases.items() if current.get(key, 0) + delta > DAILY_HOURS_LIMIT]
+        if over:
+            raise ValidationError(_over_limit_message(over))
+
+    # Sorted so concurrent writers take ledger row locks in the same order
+    items = sorted(deltas.items())
+    table = connection.ops.quote_name(DailyHours._meta.db_table)
+    sql = UPSERT_SQL.format(table=table, values=', '.join(['(%s, %s, %s)'] * len(items)))
+    params = [value for (employee_id, date), delta in items for value in (employee_id, date, delta)]
+    try:
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(sql, params)
+    except IntegrityError:
+        raise ValidationError(_over_limit_message({date for _, date in increases}))
+
+def _logged_sql():
+    quote = connection.ops.quote_name
+    return LOGGED_SQL.format(entry=quote(TimesheetEntry._meta.db_table), timesheet=quote(Timesheet._meta.db_table))
+
+def over_limit_days():
+    """(employee_id, date, hours) for days whose logged hours already exceed the cap."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'SELECT employee_id, date, hours FROM ({_logged_sql()}) logged WHERE hours > %s ORDER BY employee_id, date',
+            [DAILY_HOURS_LIMIT]
+        )
+        return cursor.fetchall()
+
+def rebuild_ledger():
+    """Recompute the whole ledger from entries and compact timesheets."""
+    table = connection.ops.quote_name(DailyHours._meta.db_table)
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {table}')
+        cursor.execute(f'INSERT INTO {table} (employee_id, date, hours) {_logged_sql()}')
+        return cursor.rowcount
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+from timesheets.models import Timesheet
+from timesheets.storage import convert_to_compact, convert_to_rows
+
+class Command(BaseCommand):
+    help = (
+        'Convert existing timesheets between row storage (one TimesheetEntry per day) '
+        'and compact storage (7-slot array on Timesheet), in locked batches.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--to', choices=['compact', 'rows'], required=True)
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        compact = options['to'] == 'compact'
+        convert = convert_to_compact if compact else convert_to_rows
+        pending = Timesheet.objects.filter(daily_hours__isnull=compact).order_by('pk')
+
+        converted, skipped, last_pk = 0, [], 0
+        while True:
+            batch = list(pending.filter(pk__gt=last_pk).values_list('pk', flat=True)[:options['batch_size']])
+            if not batch:
+                break
+            count, batch_skipped = convert(batch)
+            converted += count
+            skipped += batch_skipped
+            last_pk = batch[-1]
+            self.stdout.write(f'Converted {converted} timesheets...')
+
+        self.stdout.write(self.style.SUCCESS(f"Converted {converted} timesheets to {options['to']} storage."))
+        if skipped:
+            self.stdout.write(self.style.WARNING(
+                f'Skipped {len(skipped)} timesheets with entries outside their week: {skipped}'
+            ))
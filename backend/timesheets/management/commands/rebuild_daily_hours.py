@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand, CommandError
+from timesheets.ledger import over_limit_days, rebuild_ledger
+from timesheets.models import DAILY_HOURS_LIMIT
+
+class Command(BaseCommand):
+    help = 'Recompute the per-employee daily hours ledger from timesheet entries (backfill or repair).'
+
+    def handle(self, *args, **options):
+        offenders = over_limit_days()
+        if offenders:
+            for employee_id, date, hours in offenders:
+                self.stdout.write(f'employee {employee_id} logged {hours} hours on {date:%Y-%m-%d}')
+            raise CommandError(
+                f'{len(offenders)} days exceed {DAILY_HOURS_LIMIT} hours; correct those timesheets and rerun.'
+            )
+
+        rows = rebuild_ledger()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt daily hours ledger with {rows} employee days.'))
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from timesheets.costs import rebuild_project_costs
+
+class Command(BaseCommand):
+    help = 'Recompute Project.actual_cost from approved timesheet hours and the hourly rate table (backfill or repair).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=500, help='Approved timesheets costed per batch.')
+        parser.add_argument('--dry-run', action='store_true', help='Report changed projects without saving.')
+
+    def handle(self, *args, **options):
+        changed = rebuild_project_costs(options['chunk_size'], dry_run=options['dry_run'])
+        for project, previous in changed:
+            self.stdout.write(f'project {project.pk} ({project.name}): {previous} -> {project.actual_cost}')
+        verb = 'Found' if options['dry_run'] else 'Updated'
+        self.stdout.write(self.style.SUCCESS(f'{verb} actual cost on {len(changed)} projects.'))
@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from users.models import User
+from timesheets.reminders import send_missing_timesheet_reminders
+
+class Command(BaseCommand):
+    help = (
+        'Notify users who have no submitted or approved timesheet for a week. '
+        'Meant to run from cron (e.g. Fridays); reruns only reach users not yet reminded.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--week', help='Week start date (YYYY-MM-DD). Defaults to the current week.')
+        parser.add_argument(
+            '--roles', default=User.Roles.EMPLOYEE,
+            help='Comma-separated roles expected to log time. Defaults to EMPLOYEE.'
+        )
+        parser.add_argument('--dry-run', action='store_true', help='Count recipients without notifying them.')
+
+    def handle(self, *args, **options):
+        if options['week']:
+            try:
+                week_start = parse_date(options['week'])
+            except ValueError:
+                # Well-formed but impossible dates such as 2026-02-30
+                week_start = None
+            if week_start is None:
+                raise CommandError('Week must be in YYYY-MM-DD format.')
+        else:
+            today = timezone.now().date()
+            week_start = today - timezone.timedelta(days=today.weekday())
+
+        roles = [role.strip().upper() for role in options['roles'].split(',') if role.strip()]
+        invalid = set(roles) - set(User.Roles.values)
+        if invalid:
+            raise CommandError(f'Unknown roles: {", ".join(sorted(invalid))}')
+
+        run = send_missing_timesheet_reminders(week_start, roles, dry_run=options['dry_run'])
+        verb = 'Would remind' if run['dry_run'] else 'Reminded'
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {run['reminded']} users for the week of {run['week_start']} in {run['duration_ms']} ms."
+        ))
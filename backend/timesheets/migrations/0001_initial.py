@@ -0,0 +1,103 @@
+# Generated by Django 5.0.2 on 2026-10-18 12:50
+
+import django.contrib.postgres.fields
+import django.core.validators
+import django.db.models.deletion
+from decimal import Decimal
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('projects', '0004_task_board_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HourlyRate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('effective_from', models.DateField()),
+                ('rate', models.DecimalField(decimal_places=2, max_digits=8, validators=[django.core.validators.MinValueValidator(0)])),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('employee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='hourly_rates', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['employee', '-effective_from'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Timesheet',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('week_start_date', models.DateField()),
+                ('status', models.CharField(choices=[('DRAFT', 'Draft'), ('SUBMITTED', 'Submitted'), ('APPROVED', 'Approved'), ('REJECTED', 'Rejected')], default='DRAFT', max_length=20)),
+                ('total_hours', models.DecimalField(decimal_places=2, default=0, max_digits=5)),
+                ('notes', models.TextField(blank=True)),
+                ('approved_at', models.DateTimeField(blank=True, null=True)),
+                ('daily_hours', django.contrib.postgres.fields.ArrayField(base_field=models.DecimalField(decimal_places=2, max_digits=5), blank=True, null=True, size=7)),
+                ('daily_notes', models.JSONField(blank=True, default=dict)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('approved_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='approved_timesheets', to=settings.AUTH_USER_MODEL)),
+                ('employee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='timesheets', to=settings.AUTH_USER_MODEL)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='timesheets', to='projects.project')),
+            ],
+            options={
+                'ordering': ['-week_start_date'],
+            },
+        ),
+        migrations.CreateModel(
+            name='TimesheetEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('hours', models.DecimalField(decimal_places=2, max_digits=5, validators=[django.core.validators.MinValueValidator(0), django.core.validators.MaxValueValidator(24)])),
+                ('description', models.TextField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('timesheet', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='entries', to='timesheets.timesheet')),
+            ],
+            options={
+                'ordering': ['date'],
+            },
+        ),
+        migrations.CreateModel(
+            name='DailyHours',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('hours', models.DecimalField(decimal_places=2, default=0, max_digits=5)),
+                ('employee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_hours', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['date', 'hours'], name='timesheets__date_4cbab4_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='dailyhours',
+            constraint=models.CheckConstraint(check=models.Q(('hours__lte', Decimal('24'))), name='daily_hours_within_limit'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='dailyhours',
+            unique_together={('employee', 'date')},
+        ),
+        migrations.AlterUniqueTogether(
+            name='hourlyrate',
+            unique_together={('employee', 'effective_from')},
+        ),
+        migrations.AlterUniqueTogether(
+            name='timesheet',
+            unique_together={('employee', 'project', 'week_start_date')},
+        ),
+        migrations.AlterUniqueTogether(
+            name='timesheetentry',
+            unique_together={('timesheet', 'date')},
+        ),
+    ]
@@ -1,32 +1,18 @@
-from django.db import models
+import datetime
+from decimal import Decimal
+from django.contrib.postgres.fields import ArrayField
+from django.core.exceptions import ValidationError
+from django.db import models, transaction
+from django.db.models import OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
 from django.conf import settings
+from django.utils import timezone
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils.translation import gettext_lazy as _
+from projects.models import Project
 
-class Project(models.Model):
-    name = models.CharField(max_length=200)
-    description = models.TextField(blank=True)
-    client = models.CharField(max_length=200)
-    start_date = models.DateField()
-    end_date = models.DateField(null=True, blank=True)
-    status = models.CharField(
-        max_length=20,
-        choices=[
-            ('PLANNING', _('Planning')),
-            ('IN_PROGRESS', _('In Progress')),
-            ('COMPLETED', _('Completed')),
-            ('ON_HOLD', _('On Hold')),
-        ],
-        default='PLANNING'
-    )
-    created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
-
-    class Meta:
-        ordering = ['-created_at']
-
-    def __str__(self):
-        return self.name
+# Most hours one employee can log on a calendar day, across all projects
+DAILY_HOURS_LIMIT = Decimal('24')
 
 class Timesheet(models.Model):
     class Status(models.TextChoices):
@@ -43,9 +29,16 @@ class Timesheet(models.Model):
     notes = models.TextField(blank=True)
     approved_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name='approved_timesheets')
     approved_at = models.DateTimeField(null=True, blank=True)
+    # Compact storage (TIMESHEET_STORAGE = 'compact'): when set, the week's hours
+    # live here Monday..Sunday and the per-day descriptions in daily_notes
+    # ({'<day>': text}, only for days with an entry) instead of TimesheetEntry rows.
+    daily_hours = ArrayField(models.DecimalField(max_digits=5, decimal_places=2), size=7, null=True, blank=True)
+    daily_notes = models.JSONField(default=dict, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    _loaded_status = None
+
     class Meta:
         unique_together = ['employee', 'project', 'week_start_date']
         ordering = ['-week_start_date']
@@ -53,6 +46,138 @@ class Timesheet(models.Model):
     def __str__(self):
         return f"{self.employee.get_full_name()} - {self.project.name} - {self.week_start_date}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_status = instance.__dict__.get('status')
+        return instance
+
+    def save(self, *args, **kwargs):
+        was_approved = self._loaded_status == self.Status.APPROVED
+        approved = self.status == self.Status.APPROVED
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if approved != was_approved:
+                from .costs import apply_timesheet_costs
+                apply_timesheet_costs([self.pk], sign=1 if approved else -1)
+        self._loaded_status = self.status
+
+    # Entry fields a week submission can change, compared by sync_entries
+    entry_fields = ('hours', 'description')
+
+    @property
+    def is_compact(self):
+        return self.daily_hours is not None
+
+    def day_index(self, date):
+        day = (date - self.week_start_date).days
+        if not 0 <= day < 7:
+            raise ValidationError(_('Entry dates must fall within the timesheet week.'))
+        return day
+
+    def get_entries(self):
+        """
+        The week's entries in date order for either storage mode. Compact
+        weeks yield unsaved TimesheetEntry objects built from the arrays.
+        """
+        if not self.is_compact:
+            return self.entries.all()
+        return [
+            TimesheetEntry(
+                timesheet=self,
+                date=self.week_start_date + datetime.timedelta(days=day),
+                hours=hours,
+                description=self.daily_notes.get(str(day), ''),
+                created_at=self.created_at,
+                updated_at=self.updated_at,
+            )
+            for day, hours in enumerate(self.daily_hours)
+            if hours or str(day) in self.daily_notes
+        ]
+
+    def set_compact_entries(self, entries_data):
+        """Store entries_data in the compact columns and set total_hours; the caller saves."""
+        hours = [Decimal('0.00')] * 7
+        notes = {}
+        for entry_data in entries_data:
+            day = self.day_index(entry_data['date'])
+            hours[day] = Decimal(entry_data['hours'])
+            notes[str(day)] = entry_data.get('description', '')
+        self.daily_hours = hours
+        self.daily_notes = notes
+        self.total_hours = sum(hours, Decimal('0'))
+
+    def lock(self):
+        """Take the row lock that serializes entry writes against this timesheet."""
+        Timesheet.objects.select_for_update().filter(pk=self.pk).values_list('pk', flat=True).first()
+
+    def update_total_hours(self):
+        """Recompute total_hours from the entries in a single UPDATE."""
+        total = (
+            TimesheetEntry.objects.filter(timesheet=OuterRef('pk'))
+            .order_by().values('timesheet').annotate(total=Sum('hours')).values('total')
+        )
+        Timesheet.objects.filter(pk=self.pk).update(total_hours=Coalesce(Subquery(total), Value(Decimal('0'))))
+        from .summary import invalidate_summaries_on_commit
+        invalidate_summaries_on_commit([self.employee_id])
+
+    def sync_entries(self, entries_data):
+        """
+        Make the timesheet's entries match entries_data, keyed by date: one
+        bulk INSERT for new days, one bulk UPDATE for changed days and one
+        DELETE for dropped days, leaving unchanged rows untouched. Must run
+        inside a transaction; the row lock keeps concurrent writers out, so
+        the new total is just the sum of the incoming entries. Compact
+        timesheets only rewrite their arrays; either way the caller saves.
+        The employee's daily hours ledger is adjusted in the same
+        transaction and raises ValidationError if a day would exceed the cap.
+        """
+        from .costs import apply_day_costs
+        from .ledger import apply_daily_hours, day_deltas
+
+        incoming = {entry_data['date']: entry_data for entry_data in entries_data}
+        after = {date: Decimal(entry_data['hours']) for date, entry_data in incoming.items()}
+        self.lock()
+        if self.is_compact:
+            self.refresh_from_db(fields=['daily_hours', 'daily_notes'])
+            before = {entry.date: entry.hours for entry in self.get_entries()}
+            self.set_compact_entries(incoming.values())
+            apply_daily_hours(day_deltas(self.employee_id, before, after))
+            apply_day_costs(self, before, after)
+            return {'created': len(after.keys() - before.keys()), 'updated': len(after.keys() & before.keys()),
+                    'deleted': len(before.keys() - after.keys())}
+
+        existing = {entry.date: entry for entry in self.entries.all()}
+        before = {date: entry.hours for date, entry in existing.items()}
+
+        now = timezone.now()
+        to_create, to_update = [], []
+        for date, entry_data in incoming.items():
+            entry = existing.get(date)
+            if entry is None:
+                to_create.append(TimesheetEntry(**{**entry_data, 'timesheet': self}))
+                continue
+            changed = False
+            for field in self.entry_fields:
+                if field in entry_data and getattr(entry, field) != entry_data[field]:
+                    setattr(entry, field, entry_data[field])
+                    changed = True
+            if changed:
+                entry.updated_at = now
+                to_update.append(entry)
+        to_delete = [entry.pk for date, entry in existing.items() if date not in incoming]
+
+        apply_daily_hours(day_deltas(self.employee_id, before, after))
+        apply_day_costs(self, before, after)
+        if to_create:
+            TimesheetEntry.objects.bulk_create(to_create)
+        if to_update:
+            TimesheetEntry.objects.bulk_update(to_update, list(self.entry_fields) + ['updated_at'])
+        if to_delete:
+            TimesheetEntry.objects.filter(pk__in=to_delete).delete()
+        self.total_hours = sum(after.values(), Decimal('0'))
+        return {'created': len(to_create), 'updated': len(to_update), 'deleted': len(to_delete)}
+
 class TimesheetEntry(models.Model):
     timesheet = models.ForeignKey(Timesheet, on_delete=models.CASCADE, related_name='entries')
     date = models.DateField()
@@ -72,8 +197,107 @@ class TimesheetEntry(models.Model):
     def __str__(self):
         return f"{self.timesheet.employee.get_full_name()} - {self.date} - {self.hours} hours"
 
+    # Single-entry writes (admin, shell); the API writes whole weeks through Timesheet.sync_entries
     def save(self, *args, **kwargs):
-        super().save(*args, **kwargs)
-        # Update total hours in timesheet
-        self.timesheet.total_hours = sum(entry.hours for entry in self.timesheet.entries.all())
-        self.timesheet.save()
+        from .costs import apply_day_costs
+        from .ledger import apply_daily_hours, day_deltas
+
+        with transaction.atomic():
+            self.timesheet.lock()
+            before = {}
+            if self.pk is not None:
+                before = dict(TimesheetEntry.objects.filter(pk=self.pk).values_list('date', 'hours'))
+            after = {self.date: Decimal(self.hours)}
+            apply_daily_hours(day_deltas(self.timesheet.employee_id, before, after))
+            apply_day_costs(self.timesheet, before, after)
+            super().save(*args, **kwargs)
+            self.timesheet.update_total_hours()
+
+    def delete(self, *args, **kwargs):
+        from .costs import apply_day_costs
+        from .ledger import apply_daily_hours, day_deltas
+
+        with transaction.atomic():
+            self.timesheet.lock()
+            before = {self.date: self.hours}
+            apply_daily_hours(day_deltas(self.timesheet.employee_id, before, {}))
+            apply_day_costs(self.timesheet, before, {})
+            result = super().delete(*args, **kwargs)
+            self.timesheet.update_total_hours()
+        return result
+
+class DailyHours(models.Model):
+    """
+    Hours an employee has logged per calendar day across all projects and
+    timesheets, kept in step with entry writes by timesheets.ledger. The
+    check constraint enforces the daily cap on a single row.
+    """
+    employee = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='daily_hours')
+    date = models.DateField()
+    hours = models.DecimalField(max_digits=5, decimal_places=2, default=0)
+
+    class Meta:
+        unique_together = ['employee', 'date']
+        indexes = [
+            models.Index(fields=['date', 'hours']),
+        ]
+        constraints = [
+            models.CheckConstraint(check=models.Q(hours__lte=DAILY_HOURS_LIMIT), name='daily_hours_within_limit'),
+        ]
+
+    def __str__(self):
+        return f"{self.employee_id} - {self.date} - {self.hours} hours"
+
+class HourlyRate(models.Model):
+    """
+    An employee's cost per hour from effective_from until their next rate.
+    Approved timesheet hours are costed at the rate in effect on each day
+    and rolled into Project.actual_cost by timesheets.costs.
+    """
+    employee = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='hourly_rates')
+    effective_from = models.DateField()
+    rate = models.DecimalField(max_digits=8, decimal_places=2, validators=[MinValueValidator(0)])
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    _loaded_employee_id = None
+    _loaded_effective_from = None
+
+    class Meta:
+        unique_together = ['employee', 'effective_from']
+        ordering = ['employee', '-effective_from']
+
+    def __str__(self):
+        return f"{self.employee_id} - {self.rate}/h from {self.effective_from}"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_employee_id = instance.__dict__.get('employee_id')
+        instance._loaded_effective_from = instance.__dict__.get('effective_from')
+        return instance
+
+    def _changed_since(self):
+        """Earliest day per affected employee whose rate this write can change."""
+        since = {self.employee_id: self.effective_from}
+        if self._loaded_employee_id is not None:
+            previous = since.get(self._loaded_employee_id, self._loaded_effective_from)
+            since[self._loaded_employee_id] = min(previous, self._loaded_effective_from)
+        return since
+
+    def save(self, *args, **kwargs):
+        from .costs import reprice_approved_hours
+
+        with transaction.atomic():
+            since = self._changed_since()
+            with reprice_approved_hours(since):
+                super().save(*args, **kwargs)
+        self._loaded_employee_id = self.employee_id
+        self._loaded_effective_from = self.effective_from
+
+    def delete(self, *args, **kwargs):
+        from .costs import reprice_approved_hours
+
+        with transaction.atomic():
+            with reprice_approved_hours({self.employee_id: self.effective_from}):
+                return super().delete(*args, **kwargs)
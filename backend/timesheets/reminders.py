@@ -0,0 +1,65 @@
+import logging
+import time
+from django.core.cache import cache
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+from users.models import User
+from webtrack_notifications.models import Notification
+from .models import Timesheet
+
+logger = logging.getLogger(__name__)
+
+LAST_RUN_KEY = 'timesheets:reminders:last-run'
+SUBMITTED_STATUSES = [Timesheet.Status.SUBMITTED, Timesheet.Status.APPROVED]
+
+def reminder_title(week_start):
+    return f'Timesheet missing for the week of {week_start:%b %d, %Y}'
+
+def missing_timesheet_users(week_start, roles):
+    """
+    Active users in roles with no submitted or approved timesheet for the
+    week and no reminder for it yet, as one query with two NOT EXISTS
+    anti-joins.
+    """
+    submitted = Timesheet.objects.filter(
+        employee=OuterRef('pk'), week_start_date=week_start, status__in=SUBMITTED_STATUSES
+    )
+    reminded = Notification.objects.filter(
+        recipient=OuterRef('pk'),
+        notification_type=Notification.NotificationType.SYSTEM,
+        title=reminder_title(week_start),
+    )
+    return (
+        User.objects.filter(is_active=True, role__in=roles)
+        .filter(~Exists(submitted), ~Exists(reminded))
+        .order_by()
+    )
+
+def send_missing_timesheet_reminders(week_start, roles, dry_run=False):
+    started = time.monotonic()
+    recipient_ids = list(missing_timesheet_users(week_start, roles).values_list('pk', flat=True))
+    if not dry_run:
+        title = reminder_title(week_start)
+        message = f'Please submit your timesheet for the week starting {week_start:%Y-%m-%d}.'
+        Notification.objects.bulk_create([
+            Notification(
+                recipient_id=recipient_id,
+                title=title,
+                message=message,
+                notification_type=Notification.NotificationType.SYSTEM,
+                priority=Notification.Priority.HIGH,
+            )
+            for recipient_id in recipient_ids
+        ], batch_size=1000)
+
+    run = {
+        'week_start': week_start.isoformat(),
+        'reminded': len(recipient_ids),
+        'dry_run': dry_run,
+        'duration_ms': round((time.monotonic() - started) * 1000, 1),
+        'finished_at': timezone.now().isoformat(),
+    }
+    if not dry_run:
+        cache.set(LAST_RUN_KEY, run, None)
+    logger.info('Missing timesheet reminders: %s', run)
+    return run
@@ -1,6 +1,12 @@
+from decimal import Decimal
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
+from django.db.models import Prefetch
 from rest_framework import serializers
+from .ledger import apply_daily_hours, day_deltas
 from .models import Project, Timesheet, TimesheetEntry
-from users.serializers import UserSerializer
+from users.serializers import UserRefSerializer
 from django.utils import timezone
 
 class ProjectSerializer(serializers.ModelSerializer):
@@ -12,19 +18,32 @@ class TimesheetEntrySerializer(serializers.ModelSerializer):
     class Meta:
         model = TimesheetEntry
         fields = '__all__'
-        read_only_fields = ('created_at', 'updated_at')
+        read_only_fields = ('timesheet', 'created_at', 'updated_at')
+
+def validate_week_entries(week_start_date, entries):
+    """Compact timesheets have one slot per weekday, so entries must fall inside the week."""
+    for entry in entries:
+        if not 0 <= (entry['date'] - week_start_date).days < 7:
+            raise serializers.ValidationError({'entries': 'Entry dates must fall within the timesheet week.'})
 
 class TimesheetSerializer(serializers.ModelSerializer):
-    employee = UserSerializer(read_only=True)
+    employee = UserRefSerializer(read_only=True)
     project = ProjectSerializer(read_only=True)
-    entries = TimesheetEntrySerializer(many=True, read_only=True)
-    approved_by = UserSerializer(read_only=True)
+    entries = TimesheetEntrySerializer(many=True, read_only=True, source='get_entries')
+    approved_by = UserRefSerializer(read_only=True)
 
     class Meta:
         model = Timesheet
-        fields = '__all__'
+        exclude = ('daily_hours', 'daily_notes')
         read_only_fields = ('created_at', 'updated_at', 'total_hours', 'approved_at')
 
+    @staticmethod
+    def setup_eager_loading(queryset):
+        """Load every nested relation up front so a page costs a fixed number of queries."""
+        return queryset.select_related('employee', 'approved_by', 'project').prefetch_related(
+            Prefetch('entries', queryset=TimesheetEntry.objects.order_by('date'))
+        )
+
 class TimesheetCreateSerializer(serializers.ModelSerializer):
     entries = TimesheetEntrySerializer(many=True)
     project_id = serializers.IntegerField(write_only=True)
@@ -34,14 +53,35 @@ class TimesheetCreateSerializer(serializers.ModelSerializer):
         fields = ('project_id', 'week_start_date', 'notes', 'entries')
         read_only_fields = ('employee', 'status', 'total_hours', 'approved_by', 'approved_at')
 
+    def validate(self, data):
+        if settings.TIMESHEET_STORAGE == 'compact':
+            validate_week_entries(data['week_start_date'], data['entries'])
+        return data
+
     def create(self, validated_data):
         entries_data = validated_data.pop('entries')
-        validated_data['employee'] = self.context['request'].user
-        timesheet = Timesheet.objects.create(**validated_data)
-        for entry_data in entries_data:
-            TimesheetEntry.objects.create(timesheet=timesheet, **entry_data)
+        timesheet = Timesheet(employee=self.context['request'].user, **validated_data)
+        logged = {entry_data['date']: Decimal(entry_data['hours']) for entry_data in entries_data}
+        try:
+            with transaction.atomic():
+                apply_daily_hours(day_deltas(timesheet.employee_id, {}, logged))
+                if settings.TIMESHEET_STORAGE == 'compact':
+                    timesheet.set_compact_entries(entries_data)
+                    timesheet.save()
+                else:
+                    timesheet.total_hours = sum(logged.values(), Decimal('0'))
+                    timesheet.save()
+                    TimesheetEntry.objects.bulk_create([
+                        TimesheetEntry(**{**entry_data, 'timesheet': timesheet}) for entry_data in entries_data
+                    ])
+        except DjangoValidationError as exc:
+            raise serializers.ValidationError({'entries': exc.messages})
         return timesheet
 
+    def to_representation(self, instance):
+        # The writable entries field reads instance.entries, which is empty for compact weeks
+        return TimesheetSerializer(instance, context=self.context).data
+
 class TimesheetUpdateSerializer(serializers.ModelSerializer):
     entries = TimesheetEntrySerializer(many=True)
 
@@ -50,15 +90,26 @@ class TimesheetUpdateSerializer(serializers.ModelSerializer):
         fields = ('notes', 'entries')
         read_only_fields = ('employee', 'project', 'week_start_date', 'status', 'total_hours', 'approved_by', 'approved_at')
 
+    def validate(self, data):
+        if self.instance.is_compact:
+            validate_week_entries(self.instance.week_start_date, data.get('entries', []))
+        return data
+
     def update(self, instance, validated_data):
         entries_data = validated_data.pop('entries')
-        instance.entries.all().delete()  # Remove existing entries
-        for entry_data in entries_data:
-            TimesheetEntry.objects.create(timesheet=instance, **entry_data)
-        instance.notes = validated_data.get('notes', instance.notes)
-        instance.save()
+        try:
+            with transaction.atomic():
+                instance.sync_entries(entries_data)
+                instance.notes = validated_data.get('notes', instance.notes)
+                instance.save(update_fields=['notes', 'total_hours', 'daily_hours', 'daily_notes', 'updated_at'])
+        except DjangoValidationError as exc:
+            raise serializers.ValidationError({'entries': exc.messages})
         return instance
 
+    def to_representation(self, instance):
+        # The writable entries field reads instance.entries, which is empty for compact weeks
+        return TimesheetSerializer(instance, context=self.context).data
+
 class TimesheetApprovalSerializer(serializers.ModelSerializer):
     class Meta:
         model = Timesheet
@@ -75,3 +126,22 @@ class TimesheetApprovalSerializer(serializers.ModelSerializer):
                 instance.approved_at = timezone.now()
         instance.save()
         return instance
+
+class TimesheetBulkApprovalSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.IntegerField(), allow_empty=False, max_length=1000)
+    status = serializers.ChoiceField(choices=[Timesheet.Status.APPROVED, Timesheet.Status.REJECTED])
+
+class TimesheetCopyForwardSerializer(serializers.Serializer):
+    source_week = serializers.DateField(required=False)
+    target_week = serializers.DateField(required=False)
+    employees = serializers.ListField(child=serializers.IntegerField(), required=False, allow_empty=False, max_length=1000)
+    project_id = serializers.IntegerField(required=False)
+
+    def validate(self, data):
+        if 'target_week' not in data:
+            today = timezone.now().date()
+            data['target_week'] = today - timezone.timedelta(days=today.weekday())
+        data.setdefault('source_week', data['target_week'] - timezone.timedelta(days=7))
+        if data['source_week'] == data['target_week']:
+            raise serializers.ValidationError('Source and target weeks must differ.')
+        return data
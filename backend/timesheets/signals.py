@@ -0,0 +1,21 @@
+from django.db.models.signals import post_save, post_delete, pre_delete
+from django.dispatch import receiver
+from .costs import apply_timesheet_costs
+from .ledger import apply_daily_hours, timesheet_deltas
+from .models import Timesheet
+from .summary import invalidate_summaries_on_commit
+
+@receiver(post_save, sender=Timesheet)
+@receiver(post_delete, sender=Timesheet)
+def invalidate_timesheet_summaries(sender, instance, **kwargs):
+    invalidate_summaries_on_commit([instance.employee_id])
+
+@receiver(pre_delete, sender=Timesheet)
+def release_daily_hours(sender, instance, **kwargs):
+    # Entries go with the timesheet by cascade, which bypasses TimesheetEntry.delete
+    apply_daily_hours(timesheet_deltas([instance.pk], sign=-1))
+
+@receiver(pre_delete, sender=Timesheet)
+def release_project_costs(sender, instance, **kwargs):
+    if instance._loaded_status == Timesheet.Status.APPROVED:
+        apply_timesheet_costs([instance.pk], sign=-1)
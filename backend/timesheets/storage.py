@@ -0,0 +1,39 @@
+from collections import defaultdict
+from django.db import transaction
+from .models import Timesheet, TimesheetEntry
+
+def convert_to_compact(timesheet_ids):
+    """
+    Move the entries of the given row-mode timesheets into the compact
+    columns and delete the rows. Timesheets with entries outside their week
+    cannot be represented in seven slots and are returned as skipped.
+    """
+    with transaction.atomic():
+        timesheets = list(Timesheet.objects.select_for_update().filter(pk__in=timesheet_ids, daily_hours__isnull=True))
+        entries = defaultdict(list)
+        for entry in TimesheetEntry.objects.filter(timesheet__in=timesheets).values('timesheet_id', 'date', 'hours', 'description'):
+            entries[entry['timesheet_id']].append(entry)
+
+        converted, skipped = [], []
+        for timesheet in timesheets:
+            week = entries[timesheet.pk]
+            if any(not 0 <= (entry['date'] - timesheet.week_start_date).days < 7 for entry in week):
+                skipped.append(timesheet.pk)
+                continue
+            timesheet.set_compact_entries(week)
+            converted.append(timesheet)
+
+        Timesheet.objects.bulk_update(converted, ['daily_hours', 'daily_notes', 'total_hours'])
+        TimesheetEntry.objects.filter(timesheet__in=converted).delete()
+    return len(converted), skipped
+
+def convert_to_rows(timesheet_ids):
+    """Expand the given compact timesheets back into TimesheetEntry rows."""
+    with transaction.atomic():
+        timesheets = list(Timesheet.objects.select_for_update().filter(pk__in=timesheet_ids, daily_hours__isnull=False))
+        TimesheetEntry.objects.bulk_create([entry for timesheet in timesheets for entry in timesheet.get_entries()])
+        for timesheet in timesheets:
+            timesheet.daily_hours = None
+            timesheet.daily_notes = {}
+        Timesheet.objects.bulk_update(timesheets, ['daily_hours', 'daily_notes'])
+    return len(timesheets), []
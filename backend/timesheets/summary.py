@@ -0,0 +1,103 @@
+import hashlib
+from decimal import Decimal
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q, Sum
+from users.models import ReportingLine
+from users.visibility import GENERATION_KEY as HIERARCHY_GENERATION_KEY
+from .models import Timesheet
+
+# Response key -> status filter; None sums every status
+BUCKETS = {
+    'total_hours': None,
+    'approved_hours': Timesheet.Status.APPROVED,
+    'pending_hours': Timesheet.Status.SUBMITTED,
+    'rejected_hours': Timesheet.Status.REJECTED,
+}
+ALL_VERSION_KEY = 'timesheets:summary:version:all'
+
+def _version_key(user_id):
+    return f'timesheets:summary:version:{user_id}'
+
+def _bump(keys):
+    for key in keys:
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, None)
+
+def invalidate_summaries(employee_ids):
+    """
+    A timesheet change is visible to its employee, every manager above them
+    and admins, so bump the summary versions of exactly those viewers.
+    """
+    employee_ids = {employee_id for employee_id in employee_ids if employee_id is not None}
+    if not employee_ids:
+        return
+    manager_ids = ReportingLine.objects.filter(descendant_id__in=employee_ids).values_list('ancestor_id', flat=True)
+    _bump([ALL_VERSION_KEY] + [_version_key(user_id) for user_id in employee_ids | set(manager_ids)])
+
+def invalidate_summaries_on_commit(employee_ids):
+    employee_ids = list(employee_ids)
+    transaction.on_commit(lambda: invalidate_summaries(employee_ids))
+
+def _empty():
+    return dict.fromkeys(BUCKETS, Decimal('0.00'))
+
+def compute_summary(queryset):
+    """
+    Every status bucket, per project and per week, from one GROUP BY query
+    with conditional sums; the overall totals are rolled up in Python.
+    """
+    aggregates = {
+        f'sum_{key}': Sum('total_hours', filter=Q(status=status) if status else None)
+        for key, status in BUCKETS.items()
+    }
+    rows = (
+        queryset.order_by()
+        .values('project_id', 'project__name', 'week_start_date')
+        .annotate(**aggregates)
+    )
+
+    totals = _empty()
+    by_project = {}
+    by_week = {}
+    for row in rows:
+        project = by_project.get(row['project_id'])
+        if project is None:
+            project = by_project[row['project_id']] = {
+                'project_id': row['project_id'], 'project_name': row['project__name'], **_empty()
+            }
+        week = by_week.get(row['week_start_date'])
+        if week is None:
+            week = by_week[row['week_start_date']] = {'week_start_date': row['week_start_date'], **_empty()}
+        for key in BUCKETS:
+            value = row[f'sum_{key}'] or 0
+            totals[key] += value
+            project[key] += value
+            week[key] += value
+
+    return {
+        **totals,
+        'by_project': sorted(by_project.values(), key=lambda project: project['project_name']),
+        'by_week': sorted(by_week.values(), key=lambda week: week['week_start_date'], reverse=True),
+    }
+
+def get_summary(user, queryset, params=''):
+    """
+    compute_summary for user's visible queryset, cached per user and filter
+    string until one of the visible timesheets or the hierarchy changes.
+    """
+    version_key = ALL_VERSION_KEY if user.is_admin else _version_key(user.pk)
+    versions = cache.get_many([version_key, HIERARCHY_GENERATION_KEY])
+    params_digest = hashlib.md5(params.encode()).hexdigest()
+    key = (
+        f'timesheets:summary:{user.pk}:{versions.get(version_key, 0)}:'
+        f'{versions.get(HIERARCHY_GENERATION_KEY, 0)}:{params_digest}'
+    )
+    summary = cache.get(key)
+    if summary is None:
+        summary = compute_summary(queryset)
+        cache.set(key, summary, getattr(settings, 'TIMESHEET_SUMMARY_CACHE_TIMEOUT', 300))
+    return summary
@@ -0,0 +1,120 @@
+import datetime
+from django.test import TestCase, override_settings
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.test import APIRequestFactory, force_authenticate
+from projects.models import Project
+from users.models import User
+from .models import Timesheet, TimesheetEntry
+from .serializers import TimesheetUpdateSerializer
+from .views import TimesheetViewSet
+
+WEEK = datetime.date(2024, 1, 1)
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+def day(offset):
+    return WEEK + datetime.timedelta(days=offset)
+
+@override_settings(CACHES=LOCMEM_CACHES, TIMESHEET_STORAGE='rows')
+class TimesheetUpdateQueryCountTests(TestCase):
+    """TimesheetUpdateSerializer.update costs a fixed number of queries however many days a week holds."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.employee = User.objects.create_user('employee', 'employee@example.com', 'x')
+        cls.project = Project.objects.create(name='Project', client='Client', start_date=WEEK)
+
+    def make_timesheet(self, days):
+        # One week per size, so the timesheets don't collide
+        start = day(days * 7)
+        timesheet = Timesheet.objects.create(employee=self.employee, project=self.project, week_start_date=start)
+        timesheet.sync_entries([
+            {'date': start + datetime.timedelta(days=offset), 'hours': 2, 'description': 'work'}
+            for offset in range(days)
+        ])
+        timesheet.save()
+        return timesheet
+
+    def update(self, timesheet, hours_by_offset, queries):
+        entries = [
+            {'date': str(timesheet.week_start_date + datetime.timedelta(days=offset)), 'hours': str(hours),
+             'description': 'work'}
+            for offset, hours in hours_by_offset.items()
+        ]
+        instance = Timesheet.objects.get(pk=timesheet.pk)
+        serializer = TimesheetUpdateSerializer(instance, data={'notes': '', 'entries': entries})
+        serializer.is_valid(raise_exception=True)
+        with self.assertNumQueries(queries):
+            serializer.save()
+
+    def assertStored(self, timesheet, hours_by_offset):
+        stored = dict(TimesheetEntry.objects.filter(timesheet=timesheet).values_list('date', 'hours'))
+        self.assertEqual(stored, {
+            timesheet.week_start_date + datetime.timedelta(days=offset): hours
+            for offset, hours in hours_by_offset.items()
+        })
+
+    def test_mixed_and_noop_updates(self):
+        for days in (3, 6):
+            with self.subTest(days=days):
+                timesheet = self.make_timesheet(days)
+                # Day 0 changes, day 1 is dropped, the rest are untouched and one day is added
+                hours = {0: 3, **{offset: 2 for offset in range(2, days)}, days: 1}
+                # savepoint, row lock, entries read, ledger read, ledger upsert in a savepoint (3),
+                # insert, update, delete, timesheet save in a savepoint (3), release
+                self.update(timesheet, hours, 14)
+                self.assertStored(timesheet, hours)
+                # savepoint, row lock, entries read, timesheet save in a savepoint (3), release
+                self.update(timesheet, hours, 7)
+                self.assertStored(timesheet, hours)
+
+class SizedPagination(PageNumberPagination):
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class TimesheetListQueryCountTests(TestCase):
+    """A timesheet list page costs the same queries for N and 2N timesheets."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user('admin', 'admin@example.com', 'x', role='ADMIN', is_staff=True)
+        cls.employees = [
+            User.objects.create_user(f'employee-{i}', f'employee-{i}@example.com', 'x', manager=cls.admin)
+            for i in range(3)
+        ]
+        cls.projects = [Project.objects.create(name=f'Project {i}', client='Client', start_date=WEEK) for i in range(2)]
+
+    def add_weeks(self, first_week, weeks):
+        """Timesheets of every employee on every project for weeks, with five entries each; half are approved."""
+        timesheets = Timesheet.objects.bulk_create([
+            Timesheet(
+                employee=employee, project=project, week_start_date=day(7 * week), total_hours=5,
+                status=Timesheet.Status.APPROVED if week % 2 else Timesheet.Status.DRAFT,
+                approved_by=self.admin if week % 2 else None,
+            )
+            for employee in self.employees for project in self.projects
+            for week in range(first_week, first_week + weeks)
+        ])
+        TimesheetEntry.objects.bulk_create([
+            TimesheetEntry(timesheet=timesheet, date=timesheet.week_start_date + datetime.timedelta(days=offset),
+                           hours=1, description='work')
+            for timesheet in timesheets for offset in range(5)
+        ])
+
+    def list_page(self):
+        request = APIRequestFactory().get('/api/timesheets/', {'page_size': 1000})
+        force_authenticate(request, self.admin)
+        view = TimesheetViewSet.as_view({'get': 'list'}, pagination_class=SizedPagination)
+        # count, the page with its users and project joined, and the entries prefetch
+        with self.assertNumQueries(3):
+            response = view(request)
+            response.render()
+        return response.data['results']
+
+    def test_query_count_does_not_grow_with_rows(self):
+        self.add_weeks(0, 2)
+        self.assertEqual(len(self.list_page()), 12)
+        self.add_weeks(2, 2)
+        results = self.list_page()
+        self.assertEqual(len(results), 24)
+        self.assertTrue(all(len(timesheet['entries']) == 5 for timesheet in results))
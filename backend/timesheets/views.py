@@ -1,15 +1,48 @@
+from decimal import Decimal, InvalidOperation
 from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
 from django.utils import timezone
-from django.db.models import Sum
+from django.utils.dateparse import parse_date
 from django_filters import rest_framework as filters
-from .models import Project, Timesheet, TimesheetEntry
+from users.serializers import UserRefMap
+from users.visibility import get_visibility
+from .models import DailyHours, Project, Timesheet, TimesheetEntry
+from .copying import copy_week
+from .costs import apply_timesheet_costs
+from .grid import build_grid
+from .summary import get_summary, invalidate_summaries_on_commit
 from .serializers import (
     ProjectSerializer, TimesheetSerializer, TimesheetCreateSerializer,
-    TimesheetUpdateSerializer, TimesheetApprovalSerializer
+    TimesheetUpdateSerializer, TimesheetApprovalSerializer, TimesheetBulkApprovalSerializer,
+    TimesheetCopyForwardSerializer
 )
 
+def parse_date_range(params, max_days):
+    """start_date/end_date from the query string, defaulting to the current week."""
+    dates = {}
+    for param in ('start_date', 'end_date'):
+        value = params.get(param)
+        if value:
+            try:
+                dates[param] = parse_date(value)
+            except ValueError:
+                dates[param] = None
+            if dates[param] is None:
+                raise ValueError('Dates must be in YYYY-MM-DD format.')
+
+    today = timezone.now().date()
+    start_date = dates.get('start_date') or today - timezone.timedelta(days=today.weekday())
+    end_date = dates.get('end_date') or start_date + timezone.timedelta(days=6)
+    if end_date < start_date:
+        raise ValueError('End date must not be before start date.')
+    if (end_date - start_date).days >= max_days:
+        raise ValueError(f'Date range cannot exceed {max_days} days.')
+    return start_date, end_date
+
 class ProjectViewSet(viewsets.ModelViewSet):
     queryset = Project.objects.all()
     serializer_class = ProjectSerializer
@@ -37,12 +70,10 @@ class TimesheetViewSet(viewsets.ModelViewSet):
     filterset_class = TimesheetFilter
 
     def get_queryset(self):
-        user = self.request.user
-        if user.is_admin:
-            return Timesheet.objects.all()
-        elif user.is_manager:
-            return Timesheet.objects.filter(employee__manager=user)
-        return Timesheet.objects.filter(employee=user)
+        queryset = get_visibility(self.request.user).filter_employees(Timesheet.objects.all())
+        if self.action in ['list', 'retrieve', 'current_week']:
+            queryset = TimesheetSerializer.setup_eager_loading(queryset)
+        return queryset
 
     def get_serializer_class(self):
         if self.action == 'create':
@@ -54,7 +85,7 @@ class TimesheetViewSet(viewsets.ModelViewSet):
         return TimesheetSerializer
 
     def get_permissions(self):
-        if self.action in ['approve']:
+        if self.action in ['approve', 'bulk_approve']:
             return [permissions.IsAdminUser()]
         return [permissions.IsAuthenticated()]
 
@@ -67,26 +98,110 @@ class TimesheetViewSet(viewsets.ModelViewSet):
             return Response(serializer.data)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+    @action(detail=False, methods=['post'])
+    def bulk_approve(self, request):
+        serializer = TimesheetBulkApprovalSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        ids = serializer.validated_data['ids']
+        new_status = serializer.validated_data['status']
+        changes = {'status': new_status, 'updated_at': timezone.now()}
+        if new_status == Timesheet.Status.APPROVED:
+            changes.update(approved_by=request.user, approved_at=changes['updated_at'])
+
+        visible = self.get_queryset().filter(pk__in=ids)
+        with transaction.atomic():
+            # Rows another approver holds are skipped, not waited on; statuses are read under the lock
+            locked = {
+                pk: (state, employee_id) for pk, state, employee_id in
+                visible.select_for_update(skip_locked=True).values_list('pk', 'status', 'employee_id')
+            }
+            submitted = [pk for pk, (state, _) in locked.items() if state == Timesheet.Status.SUBMITTED]
+            updated = Timesheet.objects.filter(pk__in=submitted, status=Timesheet.Status.SUBMITTED).update(**changes)
+            if new_status == Timesheet.Status.APPROVED:
+                apply_timesheet_costs(submitted)
+            invalidate_summaries_on_commit({locked[pk][1] for pk in submitted})
+            # Skipped rows are re-read now: one another approver has since decided is not retryable
+            held = dict(visible.exclude(pk__in=locked).values_list('pk', 'status'))
+
+        results = []
+        for pk in dict.fromkeys(ids):
+            if pk in locked:
+                outcome = new_status if locked[pk][0] == Timesheet.Status.SUBMITTED else 'invalid_status'
+            elif pk not in held:
+                outcome = 'not_found'
+            elif held[pk] != Timesheet.Status.SUBMITTED:
+                outcome = 'invalid_status'
+            else:
+                outcome = 'locked'
+            results.append({'id': pk, 'outcome': outcome})
+        return Response({'updated': updated, 'results': results})
+
+    @action(detail=False, methods=['post'])
+    def copy_forward(self, request):
+        serializer = TimesheetCopyForwardSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        data = serializer.validated_data
+        employee_ids = set(data.get('employees', [request.user.pk]))
+        if not request.user.is_admin and not employee_ids.issubset(get_visibility(request.user).employee_ids):
+            return Response({'error': 'You can only copy timesheets for yourself and your reports.'}, status=status.HTTP_403_FORBIDDEN)
+
+        try:
+            timesheets = copy_week(data['source_week'], data['target_week'], employee_ids, data.get('project_id'))
+        except DjangoValidationError as exc:
+            return Response({'error': exc.messages}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({'created': len(timesheets), 'timesheets': timesheets}, status=status.HTTP_201_CREATED)
+
     @action(detail=False, methods=['get'])
     def summary(self, request):
-        user = request.user
-        if user.is_admin:
-            queryset = Timesheet.objects.all()
-        elif user.is_manager:
-            queryset = Timesheet.objects.filter(employee__manager=user)
-        else:
-            queryset = Timesheet.objects.filter(employee=user)
-
-        total_hours = queryset.aggregate(total=Sum('total_hours'))['total'] or 0
-        approved_hours = queryset.filter(status=Timesheet.Status.APPROVED).aggregate(total=Sum('total_hours'))['total'] or 0
-        pending_hours = queryset.filter(status=Timesheet.Status.SUBMITTED).aggregate(total=Sum('total_hours'))['total'] or 0
-        rejected_hours = queryset.filter(status=Timesheet.Status.REJECTED).aggregate(total=Sum('total_hours'))['total'] or 0
+        queryset = self.filter_queryset(self.get_queryset())
+        return Response(get_summary(request.user, queryset, request.query_params.urlencode()))
+
+    @action(detail=False, methods=['get'])
+    def grid(self, request):
+        try:
+            start_date, end_date = parse_date_range(request.query_params, settings.TIMESHEET_GRID_MAX_DAYS)
+        except ValueError as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        timesheets = get_visibility(request.user).filter_employees(Timesheet.objects.all())
+        for param, field in (('project', 'project_id'), ('employee', 'employee_id')):
+            value = request.query_params.get(param)
+            if value:
+                if not value.isdigit():
+                    return Response({'error': f'{param} must be an id.'}, status=status.HTTP_400_BAD_REQUEST)
+                timesheets = timesheets.filter(**{field: value})
+
+        return Response(build_grid(timesheets, start_date, end_date, UserRefMap(request)))
+
+    @action(detail=False, methods=['get'])
+    def overtime(self, request):
+        try:
+            start_date, end_date = parse_date_range(request.query_params, settings.OVERTIME_REPORT_MAX_DAYS)
+            threshold = Decimal(request.query_params.get('threshold', settings.OVERTIME_DAILY_HOURS))
+        except ValueError as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        except InvalidOperation:
+            return Response({'error': 'Threshold must be a number.'}, status=status.HTTP_400_BAD_REQUEST)
 
+        days = list(
+            get_visibility(request.user).filter_employees(DailyHours.objects.all())
+            .filter(date__range=(start_date, end_date), hours__gt=threshold)
+            .order_by('date', 'employee_id').values_list('employee_id', 'date', 'hours')
+        )
+        ref_map = UserRefMap(request)
+        ref_map.load({employee_id for employee_id, _, _ in days})
         return Response({
-            'total_hours': total_hours,
-            'approved_hours': approved_hours,
-            'pending_hours': pending_hours,
-            'rejected_hours': rejected_hours,
+            'start_date': start_date,
+            'end_date': end_date,
+            'threshold': threshold,
+            'days': [
+                {'employee': ref_map.get(employee_id), 'date': date, 'hours': hours}
+                for employee_id, date, hours in days
+            ],
         })
 
     @action(detail=False, methods=['get'])
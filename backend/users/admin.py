@@ -9,11 +9,12 @@ class CustomUserAdmin(UserAdmin):
     list_filter = ('role', 'department', 'is_active', 'is_staff', 'is_verified')
     search_fields = ('username', 'email', 'first_name', 'last_name', 'department', 'position')
     ordering = ('-date_joined',)
+    raw_id_fields = ('manager',)
 
     fieldsets = (
         (None, {'fields': ('username', 'password')}),
         (_('Personal info'), {'fields': ('first_name', 'last_name', 'email', 'phone_number', 'date_of_birth', 'date_of_joining', 'profile_picture')}),
-        (_('Professional info'), {'fields': ('role', 'department', 'position')}),
+        (_('Professional info'), {'fields': ('role', 'department', 'position', 'manager')}),
         (_('Status'), {'fields': ('is_active', 'is_staff', 'is_verified')}),
         (_('Important dates'), {'fields': ('last_login', 'date_joined')}),
         (_('Permissions'), {'fields': ('groups', 'user_permissions')}),
@@ -0,0 +1,173 @@
+import threading
+import time
+from collections import OrderedDict
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from .models import User
+from .revocation import revocations
+
+class UserPrincipalCache:
+    """
+    Two-level cache of authenticated users: a small per-process LRU in front
+    of the shared Django cache (Redis). Rows are cached as plain field values
+    so every request gets its own User instance. Every concrete field except
+    excluded_fields is cached, so serializing request.user (e.g. /users/me/)
+    loads nothing lazily. Invalidation bumps a shared generation that every
+    process checks at most once per check_interval before trusting its LRU.
+    """
+    key_prefix = 'auth:user:'
+    generation_key = 'auth:user:generation'
+    # Never cache the password hash; last_login is rewritten on every login and never read per request
+    excluded_fields = ('password', 'last_login')
+
+    def __init__(self, local_size, local_timeout, timeout, check_interval=1):
+        self.local_size = local_size
+        self.local_timeout = local_timeout
+        self.timeout = timeout
+        self.check_interval = check_interval
+        self._local = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = None
+        self._checked_at = 0.0
+        self._counters = {'local_hits': 0, 'shared_hits': 0, 'misses': 0}
+        self.fields = tuple(
+            field.name for field in User._meta.concrete_fields if field.name not in self.excluded_fields
+        )
+        self.attnames = frozenset(User._meta.get_field(name).attname for name in self.fields)
+        # Field names and attnames, as either may appear in save(update_fields=...)
+        self.cached_fields = self.attnames | frozenset(self.fields)
+
+    def _key(self, user_id):
+        return f'{self.key_prefix}{user_id}'
+
+    def _count(self, name):
+        with self._lock:
+            self._counters[name] += 1
+
+    def _get_local(self, user_id):
+        with self._lock:
+            entry = self._local.get(user_id)
+            if entry is None:
+                return None
+            row, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._local[user_id]
+                return None
+            self._local.move_to_end(user_id)
+            return row
+
+    def _check_generation(self):
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval:
+            return
+        generation = cache.get_or_set(self.generation_key, 1, None)
+        with self._lock:
+            if generation != self._generation:
+                self._local.clear()
+                self._generation = generation
+            self._checked_at = now
+
+    def _set_local(self, user_id, row):
+        with self._lock:
+            self._local[user_id] = (row, time.monotonic() + self.local_timeout)
+            self._local.move_to_end(user_id)
+            while len(self._local) > self.local_size:
+                self._local.popitem(last=False)
+
+    def _to_row(self, user):
+        # Concrete field order, which from_db expects for a partial row
+        return {
+            field.attname: getattr(user, field.attname)
+            for field in User._meta.concrete_fields if field.attname in self.attnames
+        }
+
+    @staticmethod
+    def _from_row(row):
+        return User.from_db('default', list(row.keys()), list(row.values()))
+
+    def get(self, user_id):
+        user_id = str(user_id)
+        self._check_generation()
+        row = self._get_local(user_id)
+        if row is not None:
+            self._count('local_hits')
+            return self._from_row(row)
+
+        row = cache.get(self._key(user_id))
+        if row is not None:
+            self._count('shared_hits')
+        else:
+            self._count('misses')
+            user = User.objects.filter(**{api_settings.USER_ID_FIELD: user_id}).only(*self.fields).first()
+            if user is None:
+                return None
+            row = self._to_row(user)
+            cache.set(self._key(user_id), row, self.timeout)
+
+        self._set_local(user_id, row)
+        return self._from_row(row)
+
+    def invalidate(self, user_id):
+        user_id = str(user_id)
+        with self._lock:
+            self._local.pop(user_id, None)
+        cache.delete(self._key(user_id))
+        try:
+            cache.incr(self.generation_key)
+        except ValueError:
+            cache.set(self.generation_key, 1, None)
+
+    def invalidate_on_commit(self, user_id):
+        transaction.on_commit(lambda: self.invalidate(user_id))
+
+    def clear_local(self):
+        with self._lock:
+            self._local.clear()
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counters)
+            stats['local_size'] = len(self._local)
+        lookups = stats['local_hits'] + stats['shared_hits'] + stats['misses']
+        stats['hit_ratio'] = (stats['local_hits'] + stats['shared_hits']) / lookups if lookups else 0
+        return stats
+
+user_cache = UserPrincipalCache(
+    local_size=getattr(settings, 'AUTH_USER_CACHE_LOCAL_SIZE', 1024),
+    local_timeout=getattr(settings, 'AUTH_USER_CACHE_LOCAL_TIMEOUT', 30),
+    timeout=getattr(settings, 'AUTH_USER_CACHE_TIMEOUT', 300),
+    check_interval=getattr(settings, 'AUTH_USER_CACHE_LOCAL_CHECK_INTERVAL', 1),
+)
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that rejects revoked tokens and resolves the user_id
+    claim through user_cache instead of issuing a primary-key SELECT on
+    every request.
+    """
+
+    def get_validated_token(self, raw_token):
+        validated_token = super().get_validated_token(raw_token)
+        if revocations.is_revoked(validated_token.get(api_settings.JTI_CLAIM)):
+            raise InvalidToken(_('Token has been revoked'))
+        return validated_token
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_('Token contained no recognizable user identification'))
+
+        user = user_cache.get(user_id)
+        if user is None:
+            raise AuthenticationFailed(_('User not found'), code='user_not_found')
+
+        if not user.is_active:
+            raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+
+        return user
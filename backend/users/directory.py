@@ -0,0 +1,135 @@
+import re
+import threading
+import time
+from bisect import bisect_left
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
+from .models import User
+
+GENERATION_KEY = 'directory:generation'
+SEARCH_FIELDS = ('first_name', 'last_name', 'username', 'department')
+# Changes to any of these must show up in autocomplete results
+INDEXED_FIELDS = frozenset(SEARCH_FIELDS + ('role', 'is_active', 'profile_picture', 'profile_picture_hash'))
+ROW_FIELDS = ('id', 'username', 'first_name', 'last_name', 'role',
+              'profile_picture', 'profile_picture_hash', 'department')
+
+_word_separators = re.compile(r'[\s\-_.@,]+')
+
+def tokenize(value):
+    return [word for word in _word_separators.split((value or '').lower()) if word]
+
+class DirectoryIndex:
+    """
+    In-process prefix index of active users for type-ahead. Every word of
+    the searchable fields sits in one sorted array, so the users whose words
+    start with a prefix form a contiguous slice found with two bisections -
+    the lookup a trie gives, without a Python object per trie node.
+    """
+
+    def __init__(self, check_interval=5):
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._generation = None
+        self._checked_at = 0.0
+
+    def build(self):
+        rows = {}
+        pairs = []
+        for row in User.objects.filter(is_active=True).order_by().values(*ROW_FIELDS):
+            words = set()
+            for field in SEARCH_FIELDS:
+                words.update(tokenize(row[field]))
+            rows[row['id']] = (row, tuple(words))
+            pairs.extend((word, row['id']) for word in words)
+        pairs.sort()
+        keys = [word for word, _ in pairs]
+        ids = [user_id for _, user_id in pairs]
+        return keys, ids, rows
+
+    def mark_stale(self):
+        self._checked_at = 0.0
+
+    def snapshot(self):
+        now = time.monotonic()
+        if self._snapshot is not None and now - self._checked_at < self.check_interval:
+            return self._snapshot
+
+        generation = cache.get_or_set(GENERATION_KEY, 1, None)
+        self._checked_at = now
+        if self._snapshot is not None and generation == self._generation:
+            return self._snapshot
+
+        # Only the first build blocks; later refreshes serve the previous
+        # snapshot to concurrent requests until the new one is swapped in.
+        if not self._lock.acquire(blocking=self._snapshot is None):
+            return self._snapshot
+        try:
+            if self._snapshot is None or generation != self._generation:
+                self._snapshot = self.build()
+                self._generation = generation
+        finally:
+            self._lock.release()
+        return self._snapshot
+
+    def search(self, query, limit=10):
+        terms = tokenize(query)
+        if not terms:
+            return []
+
+        keys, ids, rows = self.snapshot()
+        ranges = [(bisect_left(keys, term), bisect_left(keys, term + '\uffff')) for term in terms]
+        start, end = min(ranges, key=lambda bounds: bounds[1] - bounds[0])
+        seen = set()
+        results = []
+        for position in range(start, end):
+            user_id = ids[position]
+            if user_id in seen:
+                continue
+            seen.add(user_id)
+            row, words = rows[user_id]
+            if all(any(word.startswith(term) for word in words) for term in terms):
+                results.append(row)
+                if len(results) >= limit:
+                    break
+        return results
+
+directory = DirectoryIndex(check_interval=getattr(settings, 'DIRECTORY_INDEX_CHECK_INTERVAL', 5))
+
+def invalidate_directory():
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.set(GENERATION_KEY, 1, None)
+    directory.mark_stale()
+
+def invalidate_directory_on_commit():
+    transaction.on_commit(invalidate_directory)
+
+def search_database(query, exclude_ids=(), limit=10):
+    """
+    Substring match for terms the prefix index cannot answer (e.g. "son" for
+    "Johnson"). icontains compiles to UPPER(col) LIKE, which the trigram GIN
+    indexes on User cover.
+    """
+    condition = Q()
+    for term in tokenize(query):
+        term_condition = Q()
+        for field in SEARCH_FIELDS:
+            term_condition |= Q(**{f'{field}__icontains': term})
+        condition &= term_condition
+    return list(
+        User.objects.filter(condition, is_active=True)
+        .exclude(pk__in=exclude_ids)
+        .order_by('first_name', 'last_name')
+        .values(*ROW_FIELDS)[:limit]
+    )
+
+def autocomplete(query, limit=10):
+    rows = directory.search(query, limit)
+    min_length = getattr(settings, 'USER_AUTOCOMPLETE_SUBSTRING_MIN_LENGTH', 3)
+    if len(rows) < limit and len(query.strip()) >= min_length:
+        rows += search_database(query, [row['id'] for row in rows], limit - len(rows))
+    return rows
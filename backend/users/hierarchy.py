@@ -0,0 +1,100 @@
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from .models import User, ReportingLine
+from .visibility import invalidate_hierarchy
+
+def is_in_subtree(user, root):
+    """True if user is root or one of root's transitive reports."""
+    if user.pk == root.pk:
+        return True
+    return ReportingLine.objects.filter(ancestor=root, descendant=user).exists()
+
+def _collect_subtrees(user_ids):
+    # Final manager of every user in the affected subtrees, walked level by level.
+    parents = dict(User.objects.filter(pk__in=user_ids).values_list('pk', 'manager_id'))
+    frontier = list(parents)
+    while frontier:
+        children = dict(
+            User.objects.filter(manager_id__in=frontier)
+            .exclude(pk__in=parents)
+            .values_list('pk', 'manager_id')
+        )
+        parents.update(children)
+        frontier = list(children)
+    return parents
+
+def _check_cycles(parents):
+    for start in parents:
+        seen = set()
+        node = start
+        while node in parents:
+            if node in seen:
+                raise ValidationError('Reporting lines cannot form a cycle.')
+            seen.add(node)
+            node = parents[node]
+
+@transaction.atomic
+def rebuild_subtrees(user_ids):
+    """
+    Recomputes closure rows for the given users and everyone below them,
+    leaving the rest of the hierarchy untouched.
+    """
+    parents = _collect_subtrees(user_ids)
+    if not parents:
+        return
+    _check_cycles(parents)
+
+    # Ancestors above the affected subtrees are unchanged; load them in one query.
+    external_parents = {parent for parent in parents.values() if parent is not None and parent not in parents}
+    external = {parent: [(parent, 1)] for parent in external_parents}
+    for descendant, ancestor, depth in ReportingLine.objects.filter(
+        descendant__in=external_parents
+    ).values_list('descendant', 'ancestor', 'depth'):
+        external[descendant].append((ancestor, depth + 1))
+
+    ancestors = {}
+
+    def ancestors_of(node):
+        if node not in ancestors:
+            parent = parents[node]
+            if parent is None:
+                ancestors[node] = []
+            elif parent in parents:
+                ancestors[node] = [(parent, 1)] + [(a, d + 1) for a, d in ancestors_of(parent)]
+            else:
+                ancestors[node] = external[parent]
+        return ancestors[node]
+
+    rows = []
+    for node in parents:
+        rows.extend(
+            ReportingLine(ancestor_id=ancestor, descendant_id=node, depth=depth)
+            for ancestor, depth in ancestors_of(node)
+        )
+
+    ReportingLine.objects.filter(descendant__in=parents).delete()
+    ReportingLine.objects.bulk_create(rows, batch_size=1000)
+    transaction.on_commit(invalidate_hierarchy)
+
+@transaction.atomic
+def reorganize(assignments):
+    """
+    Applies a batch of {user_id: manager_id or None} changes and rebuilds
+    only the subtrees under the moved users.
+    """
+    from .authentication import user_cache
+
+    users = User.objects.select_for_update().in_bulk(list(assignments))
+    managers = {manager_id for manager_id in assignments.values() if manager_id is not None}
+    missing = (set(assignments) - set(users)) | (managers - set(User.objects.filter(pk__in=managers).values_list('pk', flat=True)))
+    if missing:
+        raise ValidationError(f"Unknown users: {sorted(missing)}")
+
+    for user_id, user in users.items():
+        user.manager_id = assignments[user_id]
+    User.objects.bulk_update(users.values(), ['manager'])
+    rebuild_subtrees(list(users))
+
+    for user_id in users:
+        transaction.on_commit(lambda user_id=user_id: user_cache.invalidate(user_id))
+    return len(users)
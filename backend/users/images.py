@@ -0,0 +1,70 @@
+import hashlib
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connection
+from PIL import Image, ImageOps
+from .models import User
+
+logger = logging.getLogger(__name__)
+
+# Fixed-size derivatives of User.profile_picture: (width, height)
+VARIANTS = {
+    'avatar': (64, 64),
+    'card': (256, 256),
+}
+
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='profile-derivatives')
+
+def derivative_name(digest, variant):
+    """Content-addressed storage path, shared by every upload of the same image."""
+    return f'profile_pictures/derivatives/{digest[:2]}/{digest}_{variant}.jpg'
+
+def derivative_url(digest, variant):
+    return default_storage.url(derivative_name(digest, variant))
+
+def render_variant(data, size):
+    image = Image.open(BytesIO(data))
+    # Let the JPEG decoder downscale while decoding when the source is much larger.
+    image.draft('RGB', (size[0] * 2, size[1] * 2))
+    image = ImageOps.exif_transpose(image).convert('RGB')
+    image = ImageOps.fit(image, size, Image.LANCZOS)
+    output = BytesIO()
+    image.save(output, 'JPEG', quality=85, optimize=True, progressive=True)
+    return output.getvalue()
+
+def generate_derivatives(user_id):
+    from .authentication import user_cache
+    from .directory import invalidate_directory
+
+    user = User.objects.filter(pk=user_id).only('id', 'profile_picture').first()
+    if user is None or not user.profile_picture:
+        return None
+
+    with user.profile_picture.open('rb') as picture:
+        data = picture.read()
+    digest = hashlib.sha256(data).hexdigest()
+
+    for variant, size in VARIANTS.items():
+        name = derivative_name(digest, variant)
+        if not default_storage.exists(name):
+            default_storage.save(name, ContentFile(render_variant(data, size)))
+
+    # Skip the update if the picture was replaced while we were rendering.
+    User.objects.filter(pk=user_id, profile_picture=user.profile_picture.name).update(profile_picture_hash=digest)
+    user_cache.invalidate(user_id)
+    invalidate_directory()
+    return digest
+
+def _run(user_id):
+    try:
+        generate_derivatives(user_id)
+    except Exception:
+        logger.exception('Generating profile picture derivatives for user %s failed', user_id)
+    finally:
+        connection.close()
+
+def schedule_derivatives(user_id):
+    _executor.submit(_run, user_id)
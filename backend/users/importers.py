@@ -0,0 +1,135 @@
+import codecs
+import csv
+import json
+from django.db import IntegrityError, transaction
+from .directory import invalidate_directory_on_commit
+from .models import User
+from .passwords import hash_passwords
+from .serializers import UserImportSerializer
+
+# Stands in for a row whose bytes were not valid UTF-8
+UNDECODABLE = object()
+
+def _undecodable(text):
+    # errors='replace' decoding leaves U+FFFD where the bytes were invalid
+    return '\ufffd' in text
+
+class UserImporter:
+    """
+    Imports users from a CSV or NDJSON upload. Rows are read and validated
+    as they stream in, then written in batches: one username lookup, one
+    parallel hashing pass and one bulk_create per batch. Invalid rows are
+    reported by row number and never abort the import.
+    """
+    formats = ('csv', 'ndjson')
+
+    def __init__(self, batch_size=500):
+        self.batch_size = batch_size
+        self.created = 0
+        self.errors = []
+        self._seen_usernames = set()
+
+    @classmethod
+    def detect_format(cls, filename):
+        extension = filename.rsplit('.', 1)[-1].lower()
+        if extension == 'csv':
+            return 'csv'
+        if extension in ('ndjson', 'jsonl', 'json'):
+            return 'ndjson'
+        return None
+
+    def read_rows(self, upload, file_format):
+        lines = codecs.iterdecode(upload, 'utf-8-sig', errors='replace')
+        if file_format == 'csv':
+            reader = csv.DictReader(lines)
+            for row in reader:
+                values = list(row.keys()) + list(row.values())
+                if any(isinstance(value, str) and _undecodable(value) for value in values):
+                    row = UNDECODABLE
+                yield reader.line_num, row
+            return
+
+        for line_number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            if _undecodable(line):
+                yield line_number, UNDECODABLE
+                continue
+            try:
+                yield line_number, json.loads(line)
+            except ValueError:
+                yield line_number, None
+
+    def add_error(self, row_number, errors):
+        self.errors.append({'row': row_number, 'errors': errors})
+
+    def validate_row(self, row_number, row):
+        if row is UNDECODABLE:
+            self.add_error(row_number, {'non_field_errors': ['Row is not valid UTF-8 text.']})
+            return None
+        if not isinstance(row, dict):
+            self.add_error(row_number, {'non_field_errors': ['Row is not a valid object.']})
+            return None
+
+        data = {key: value for key, value in row.items() if key and value not in ('', None)}
+        serializer = UserImportSerializer(data=data)
+        if not serializer.is_valid():
+            self.add_error(row_number, serializer.errors)
+            return None
+
+        username = serializer.validated_data['username']
+        if username in self._seen_usernames:
+            self.add_error(row_number, {'username': ['Duplicate username in import file.']})
+            return None
+        self._seen_usernames.add(username)
+        return serializer.validated_data
+
+    def flush(self, batch):
+        usernames = [data['username'] for _, data in batch]
+        existing = set(User.objects.filter(username__in=usernames).values_list('username', flat=True))
+
+        pending = []
+        for row_number, data in batch:
+            if data['username'] in existing:
+                self.add_error(row_number, {'username': ['A user with that username already exists.']})
+            else:
+                pending.append((row_number, data))
+
+        passwords = hash_passwords([data.pop('password') for _, data in pending])
+        users = [User(password=password, **data) for (_, data), password in zip(pending, passwords)]
+
+        try:
+            with transaction.atomic():
+                User.objects.bulk_create(users)
+            self.created += len(users)
+        except IntegrityError:
+            # Another writer claimed a username since the lookup; retry the batch row by row.
+            for (row_number, _), user in zip(pending, users):
+                user.pk = None
+                try:
+                    with transaction.atomic():
+                        user.save()
+                    self.created += 1
+                except IntegrityError as exc:
+                    self.add_error(row_number, {'non_field_errors': [str(exc)]})
+
+    def run(self, rows):
+        batch = []
+        for row_number, row in rows:
+            data = self.validate_row(row_number, row)
+            if data is not None:
+                batch.append((row_number, data))
+            if len(batch) >= self.batch_size:
+                self.flush(batch)
+                batch = []
+        if batch:
+            self.flush(batch)
+        if self.created:
+            # bulk_create sends no post_save, so refresh the autocomplete index here
+            invalidate_directory_on_commit()
+
+        return {
+            'created': self.created,
+            'failed': len(self.errors),
+            'errors': sorted(self.errors, key=lambda error: error['row']),
+        }
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+from users.images import generate_derivatives
+from users.models import User
+
+class Command(BaseCommand):
+    help = 'Render avatar/card derivatives for profile pictures that do not have them yet.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help='Re-render every profile picture.')
+
+    def handle(self, *args, **options):
+        users = User.objects.exclude(profile_picture='').exclude(profile_picture__isnull=True)
+        if not options['all']:
+            users = users.filter(profile_picture_hash='')
+
+        rendered = 0
+        for user_id in users.values_list('pk', flat=True).iterator():
+            try:
+                if generate_derivatives(user_id):
+                    rendered += 1
+            except Exception as exc:
+                self.stderr.write(f'User {user_id}: {exc}')
+        self.stdout.write(self.style.SUCCESS(f'Rendered derivatives for {rendered} users.'))
@@ -1,5 +1,8 @@
 from django.contrib.auth.models import AbstractUser
-from django.db import models
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.core.exceptions import ValidationError
+from django.db import models, transaction
+from django.db.models.functions import Upper
 from django.utils.translation import gettext_lazy as _
 
 class User(AbstractUser):
@@ -22,6 +25,15 @@ class User(AbstractUser):
     date_of_birth = models.DateField(null=True, blank=True)
     date_of_joining = models.DateField(null=True, blank=True)
     profile_picture = models.ImageField(upload_to='profile_pictures/', null=True, blank=True)
+    # sha256 of profile_picture, set once users.images has rendered its derivatives
+    profile_picture_hash = models.CharField(max_length=64, blank=True, editable=False)
+    manager = models.ForeignKey(
+        'self',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='direct_reports'
+    )
     is_active = models.BooleanField(default=True)
     is_verified = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -31,10 +43,56 @@ class User(AbstractUser):
         verbose_name = _('User')
         verbose_name_plural = _('Users')
         ordering = ['-date_joined']
+        # Trigram indexes on UPPER(col) so icontains (search, autocomplete) avoids full scans
+        indexes = [
+            GinIndex(OpClass(Upper(field), name='gin_trgm_ops'), name=f'user_{field}_trgm')
+            for field in ('first_name', 'last_name', 'username', 'department')
+        ]
+
+    # Values as loaded from the database, used to detect changes on save
+    _loaded_manager_id = None
+    _loaded_profile_picture = ''
 
     def __str__(self):
         return f"{self.get_full_name()} ({self.role})"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_manager_id = instance.__dict__.get('manager_id')
+        instance._loaded_profile_picture = str(instance.__dict__.get('profile_picture') or '')
+        return instance
+
+    def clean(self):
+        super().clean()
+        if self.pk is not None and self.manager_id is not None and self.manager_id != self._loaded_manager_id:
+            from .hierarchy import is_in_subtree
+            if is_in_subtree(self.manager, self):
+                raise ValidationError({'manager': _('A user cannot report to themselves or one of their reports.')})
+
+    def save(self, *args, **kwargs):
+        manager_changed = self.manager_id != self._loaded_manager_id
+        picture_changed = (self.profile_picture.name or '') != self._loaded_profile_picture
+        if picture_changed:
+            self.profile_picture_hash = ''
+        # A cyclic manager makes rebuild_subtrees raise; roll the manager_id back with it
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if manager_changed:
+                from .hierarchy import rebuild_subtrees
+                rebuild_subtrees([self.pk])
+        if manager_changed:
+            self._loaded_manager_id = self.manager_id
+        if picture_changed:
+            self._loaded_profile_picture = self.profile_picture.name or ''
+            if self.profile_picture:
+                from .images import schedule_derivatives
+                transaction.on_commit(lambda: schedule_derivatives(self.pk))
+
+    def get_reports(self):
+        """All direct and transitive reports of this user."""
+        return User.objects.filter(reporting_ancestors__ancestor=self)
+
     @property
     def is_admin(self):
         return self.role == self.Roles.ADMIN
@@ -58,3 +116,22 @@ class User(AbstractUser):
     @property
     def is_employee(self):
         return self.role == self.Roles.EMPLOYEE
+
+class ReportingLine(models.Model):
+    """
+    Closure table over User.manager: one row per (ancestor, descendant) pair
+    in the reporting hierarchy, so transitive reports are a single join.
+    Maintained by users.hierarchy.
+    """
+    ancestor = models.ForeignKey(User, on_delete=models.CASCADE, related_name='reporting_descendants')
+    descendant = models.ForeignKey(User, on_delete=models.CASCADE, related_name='reporting_ancestors')
+    depth = models.PositiveSmallIntegerField()
+
+    class Meta:
+        unique_together = ['ancestor', 'descendant']
+        indexes = [
+            models.Index(fields=['descendant', 'depth']),
+        ]
+
+    def __str__(self):
+        return f"{self.ancestor_id} -> {self.descendant_id} ({self.depth})"
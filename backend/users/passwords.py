@@ -0,0 +1,73 @@
+import os
+import threading
+import django
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, TimeoutError
+from django.conf import settings
+from django.contrib.auth.hashers import make_password, verify_password
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import Throttled
+
+class PasswordHashPool:
+    """
+    Bounded thread pool for password hashing. PBKDF2 releases the GIL, so
+    hashes run in parallel while the number of concurrent and queued hashes
+    stays capped; callers beyond the cap are throttled instead of piling up.
+    """
+
+    def __init__(self, max_workers, max_pending, timeout):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='password-hash')
+        self._slots = threading.BoundedSemaphore(max_workers + max_pending)
+        self.timeout = timeout
+
+    def run(self, fn, *args):
+        if not self._slots.acquire(timeout=self.timeout):
+            raise Throttled(detail=_('Too many concurrent logins, please retry.'))
+        try:
+            future = self._executor.submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda f: self._slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except TimeoutError:
+            raise Throttled(detail=_('Too many concurrent logins, please retry.'))
+
+    def verify(self, password, encoded):
+        """Returns (is_correct, must_update) for the given raw password and hash."""
+        return self.run(verify_password, password, encoded)
+
+    def make(self, password):
+        return self.run(make_password, password)
+
+password_pool = PasswordHashPool(
+    max_workers=getattr(settings, 'LOGIN_HASH_WORKERS', 4),
+    max_pending=getattr(settings, 'LOGIN_HASH_MAX_PENDING', 32),
+    timeout=getattr(settings, 'LOGIN_HASH_TIMEOUT', 10),
+)
+
+_process_pool = None
+_process_pool_lock = threading.Lock()
+
+def _init_hash_worker(settings_module):
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+    django.setup()
+
+def get_process_pool():
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is None:
+            _process_pool = ProcessPoolExecutor(
+                max_workers=getattr(settings, 'USER_IMPORT_HASH_PROCESSES', None),
+                initializer=_init_hash_worker,
+                initargs=(os.environ.get('DJANGO_SETTINGS_MODULE', 'core.settings'),),
+            )
+        return _process_pool
+
+def hash_passwords(passwords):
+    """Hashes a batch of raw passwords across the process pool, preserving order."""
+    if not passwords:
+        return []
+    pool = get_process_pool()
+    chunksize = max(1, len(passwords) // (pool._max_workers * 4))
+    return list(pool.map(make_password, passwords, chunksize=chunksize))
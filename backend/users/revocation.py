@@ -0,0 +1,123 @@
+import hashlib
+import math
+import threading
+import time
+from django.conf import settings
+from django.core.cache import cache
+
+class BloomFilter:
+    def __init__(self, capacity, error_rate):
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def positions(self, item):
+        # Kirsch-Mitzenmacher: derive k positions from two 64-bit hashes.
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def add_positions(self, positions):
+        for position in positions:
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def has_positions(self, positions):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in positions)
+
+    def add(self, item):
+        self.add_positions(self.positions(item))
+
+    def __contains__(self, item):
+        return self.has_positions(self.positions(item))
+
+class RevocationList:
+    """
+    Revoked JWT IDs, stored in the shared cache with a TTL matching the
+    token's remaining lifetime. Each process keeps Bloom filters of known
+    revocations, bucketed by expiry so whole buckets can be dropped once
+    their tokens have expired. The filters are synced every sync_interval
+    seconds from an append-only sequence of cache entries, so a token that
+    was never revoked is accepted without a cache round trip; only Bloom
+    hits are confirmed against the cache. Revocations made by another
+    process are therefore seen here within sync_interval.
+    """
+    seq_key = 'jwt:revoked:seq'
+    floor_key = 'jwt:revoked:floor'
+
+    def __init__(self, capacity, error_rate, sync_interval, bucket_seconds=3600):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.sync_interval = sync_interval
+        self.bucket_seconds = bucket_seconds
+        self._lock = threading.Lock()
+        self._template = BloomFilter(capacity, error_rate)
+        self._buckets = {}
+        self._seen_seq = None
+        self._next_sync = 0
+
+    @staticmethod
+    def _jti_key(jti):
+        return f'jwt:revoked:jti:{jti}'
+
+    @staticmethod
+    def _entry_key(seq):
+        return f'jwt:revoked:entry:{seq}'
+
+    def _remember(self, jti, exp):
+        bucket = int(exp // self.bucket_seconds)
+        bloom = self._buckets.get(bucket)
+        if bloom is None:
+            bloom = self._buckets[bucket] = BloomFilter(self.capacity, self.error_rate)
+        bloom.add(jti)
+
+    def revoke(self, jti, exp):
+        timeout = max(1, int(exp - time.time()) + 1)
+        cache.set(self._jti_key(jti), exp, timeout)
+        cache.add(self.seq_key, 0, None)
+        seq = cache.incr(self.seq_key)
+        cache.set(self._entry_key(seq), (jti, exp), timeout)
+        with self._lock:
+            self._remember(jti, exp)
+
+    def sync(self):
+        with self._lock:
+            current = cache.get(self.seq_key, 0)
+            start = self._seen_seq
+            if start is None:
+                start = cache.get(self.floor_key, 0)
+
+            first_live = None
+            for chunk_start in range(start + 1, current + 1, 1000):
+                keys = [self._entry_key(seq) for seq in range(chunk_start, min(chunk_start + 1000, current + 1))]
+                entries = cache.get_many(keys)
+                for seq, key in enumerate(keys, start=chunk_start):
+                    if key in entries:
+                        self._remember(*entries[key])
+                        if first_live is None:
+                            first_live = seq
+            if self._seen_seq is None and first_live is not None:
+                # Entries below the first live one have expired; later startups can skip them.
+                cache.set(self.floor_key, first_live - 1, None)
+            self._seen_seq = current
+
+            current_bucket = int(time.time() // self.bucket_seconds)
+            for bucket in [bucket for bucket in self._buckets if bucket < current_bucket]:
+                del self._buckets[bucket]
+            self._next_sync = time.monotonic() + self.sync_interval
+
+    def is_revoked(self, jti):
+        if jti is None:
+            return False
+        if time.monotonic() >= self._next_sync:
+            self.sync()
+        positions = self._template.positions(jti)
+        if not any(bloom.has_positions(positions) for bloom in list(self._buckets.values())):
+            return False
+        return cache.get(self._jti_key(jti)) is not None
+
+revocations = RevocationList(
+    capacity=getattr(settings, 'JWT_REVOCATION_BLOOM_CAPACITY', 10000),
+    error_rate=getattr(settings, 'JWT_REVOCATION_BLOOM_ERROR_RATE', 0.001),
+    sync_interval=getattr(settings, 'JWT_REVOCATION_SYNC_INTERVAL', 30),
+)
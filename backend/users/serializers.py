@@ -1,18 +1,221 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from django.core.files.storage import default_storage
+from django.db.models import QuerySet
+from django.utils.translation import gettext_lazy as _
+from django.contrib.auth.models import update_last_login
+from django.contrib.auth.validators import UnicodeUsernameValidator
 from django.contrib.auth.password_validation import validate_password
+from rest_framework import exceptions
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from .hierarchy import is_in_subtree
+from .images import derivative_url
+from .passwords import password_pool
+from .revocation import revocations
 
 User = get_user_model()
 
+class ProfilePictureField(serializers.ImageField):
+    """
+    Emits the URL of a pre-rendered derivative (see users.images) instead of
+    the original upload: 'avatar' inside lists and nested payloads, 'card'
+    for a single user. Falls back to the original until rendering finishes.
+    """
+
+    def __init__(self, variant=None, **kwargs):
+        self.variant = variant
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        if not value:
+            return None
+        digest = value.instance.profile_picture_hash
+        if not digest:
+            return super().to_representation(value)
+
+        variant = self.variant or ('card' if self.parent.parent is None else 'avatar')
+        url = derivative_url(digest, variant)
+        request = self.context.get('request', None)
+        if request is not None:
+            return request.build_absolute_uri(url)
+        return url
+
 class UserSerializer(serializers.ModelSerializer):
+    profile_picture = ProfilePictureField(required=False, allow_null=True)
+
     class Meta:
         model = User
         fields = ('id', 'username', 'email', 'first_name', 'last_name', 'role',
                  'department', 'position', 'phone_number', 'date_of_birth',
-                 'date_of_joining', 'profile_picture', 'is_active', 'is_verified',
+                 'date_of_joining', 'profile_picture', 'manager', 'is_active', 'is_verified',
                  'created_at', 'updated_at')
         read_only_fields = ('id', 'created_at', 'updated_at')
 
+class LoginUserSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = User
+        fields = ('id', 'username', 'email', 'first_name', 'last_name', 'role',
+                 'department', 'position')
+        read_only_fields = fields
+
+class LoginSerializer(TokenObtainPairSerializer):
+    """
+    Token pair serializer that loads the user once, verifies the password in
+    the bounded hashing pool and returns a compact user payload alongside the
+    tokens.
+    """
+
+    def validate(self, attrs):
+        user = User._default_manager.filter(
+            **{self.username_field: attrs[self.username_field]}
+        ).first()
+
+        if user is None:
+            # Hash anyway so unknown usernames take as long as wrong passwords.
+            password_pool.make(attrs['password'])
+            is_correct, must_update = False, False
+        else:
+            is_correct, must_update = password_pool.verify(attrs['password'], user.password)
+
+        if not is_correct or not api_settings.USER_AUTHENTICATION_RULE(user):
+            raise exceptions.AuthenticationFailed(
+                self.error_messages['no_active_account'],
+                'no_active_account',
+            )
+
+        if must_update:
+            user.set_password(attrs['password'])
+            user.save(update_fields=['password'])
+
+        self.user = user
+        refresh = self.get_token(user)
+
+        if api_settings.UPDATE_LAST_LOGIN:
+            update_last_login(None, user)
+
+        return {
+            'refresh': str(refresh),
+            'access': str(refresh.access_token),
+            'user': LoginUserSerializer(user).data,
+        }
+
+class UserRefMap:
+    """
+    Request-scoped identity map of compact user representations, so a user
+    referenced many times in one response is loaded and built only once.
+    """
+    row_fields = ('id', 'username', 'first_name', 'last_name', 'role',
+                  'profile_picture', 'profile_picture_hash')
+
+    def __init__(self, request=None):
+        self.request = request
+        self.refs = {}
+
+    @classmethod
+    def for_serializer(cls, serializer):
+        request = serializer.context.get('request', None)
+        holder = request if request is not None else serializer.root
+        ref_map = getattr(holder, '_user_ref_map', None)
+        if ref_map is None:
+            ref_map = cls(request)
+            holder._user_ref_map = ref_map
+        return ref_map
+
+    def __contains__(self, user_id):
+        return user_id in self.refs
+
+    def build(self, row):
+        picture = row['profile_picture']
+        picture = getattr(picture, 'name', picture)
+        if row['profile_picture_hash']:
+            avatar = derivative_url(row['profile_picture_hash'], 'avatar')
+        elif picture:
+            avatar = default_storage.url(picture)
+        else:
+            avatar = None
+        if avatar and self.request is not None:
+            avatar = self.request.build_absolute_uri(avatar)
+
+        name = f"{row['first_name']} {row['last_name']}".strip()
+        return {
+            'id': row['id'],
+            'name': name or row['username'],
+            'role': row['role'],
+            'avatar': avatar,
+        }
+
+    def add(self, user):
+        if user.pk not in self.refs:
+            self.refs[user.pk] = self.build({field: getattr(user, field) for field in self.row_fields})
+
+    def load(self, user_ids):
+        missing = {user_id for user_id in user_ids if user_id is not None and user_id not in self.refs}
+        if missing:
+            for row in User.objects.filter(pk__in=missing).values(*self.row_fields):
+                self.refs[row['id']] = self.build(row)
+
+    def get(self, user_id):
+        self.load([user_id])
+        return self.refs.get(user_id)
+
+class UserRefSerializer(serializers.Serializer):
+    """
+    Compact read-only user embed (id, name, role, avatar) for foreign keys
+    such as employee or created_by. Rows come from values() through the
+    request's UserRefMap; on a list page every row's user is loaded in a
+    single query.
+    """
+    id = serializers.IntegerField(read_only=True)
+    name = serializers.CharField(read_only=True)
+    role = serializers.CharField(read_only=True)
+    avatar = serializers.CharField(read_only=True)
+
+    def get_attribute(self, instance):
+        if len(self.source_attrs) != 1:
+            return super().get_attribute(instance)
+
+        field = instance._meta.get_field(self.source)
+        user_id = getattr(instance, field.attname)
+        if user_id is None:
+            return None
+
+        ref_map = UserRefMap.for_serializer(self)
+        if user_id not in ref_map:
+            if field.is_cached(instance):
+                ref_map.add(field.get_cached_value(instance))
+            else:
+                ref_map.load(self._sibling_user_ids(instance, field.attname) or [user_id])
+        return user_id
+
+    def _sibling_user_ids(self, instance, attname):
+        objects = self.root.instance
+        if not isinstance(objects, (list, tuple, QuerySet)):
+            return None
+        return [getattr(obj, attname) for obj in objects if isinstance(obj, type(instance))]
+
+    def to_representation(self, value):
+        ref_map = UserRefMap.for_serializer(self)
+        if isinstance(value, User):
+            ref_map.add(value)
+            return ref_map.refs[value.pk]
+        return ref_map.get(value)
+
+class RevocationAwareTokenRefreshSerializer(TokenRefreshSerializer):
+    def validate(self, attrs):
+        refresh = self.token_class(attrs['refresh'])
+        if revocations.is_revoked(refresh.get(api_settings.JTI_CLAIM)):
+            raise InvalidToken(_('Token has been revoked'))
+
+        data = super().validate(attrs)
+        if api_settings.ROTATE_REFRESH_TOKENS and api_settings.BLACKLIST_AFTER_ROTATION:
+            revocations.revoke(refresh[api_settings.JTI_CLAIM], refresh['exp'])
+        return data
+
+class TokenRevokeSerializer(serializers.Serializer):
+    refresh = serializers.CharField(required=False)
+
 class UserCreateSerializer(serializers.ModelSerializer):
     password = serializers.CharField(write_only=True, required=True, validators=[validate_password])
     password2 = serializers.CharField(write_only=True, required=True)
@@ -45,11 +248,35 @@ class UserCreateSerializer(serializers.ModelSerializer):
         user.save()
         return user
 
+class UserImportSerializer(serializers.ModelSerializer):
+    password = serializers.CharField(write_only=True, required=True, validators=[validate_password])
+
+    class Meta:
+        model = User
+        fields = ('username', 'email', 'password', 'first_name', 'last_name',
+                 'role', 'department', 'position', 'phone_number', 'date_of_birth',
+                 'date_of_joining')
+        # Username uniqueness is checked per batch by users.importers.UserImporter
+        extra_kwargs = {'username': {'validators': [UnicodeUsernameValidator()]}}
+
 class UserUpdateSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ('first_name', 'last_name', 'email', 'department', 'position',
-                 'phone_number', 'date_of_birth', 'date_of_joining', 'profile_picture')
+                 'phone_number', 'date_of_birth', 'date_of_joining', 'profile_picture',
+                 'manager')
+
+    def validate_manager(self, value):
+        if value is not None and self.instance is not None and is_in_subtree(value, self.instance):
+            raise serializers.ValidationError("A user cannot report to themselves or one of their reports.")
+        return value
+
+class ReportingAssignmentSerializer(serializers.Serializer):
+    user = serializers.IntegerField()
+    manager = serializers.IntegerField(allow_null=True)
+
+class ReorganizeSerializer(serializers.Serializer):
+    assignments = ReportingAssignmentSerializer(many=True, allow_empty=False)
 
 class ChangePasswordSerializer(serializers.Serializer):
     old_password = serializers.CharField(required=True)
@@ -0,0 +1,45 @@
+from django.db.models.signals import post_save, post_delete, pre_delete
+from django.dispatch import receiver
+from .models import User
+from .authentication import user_cache
+from .directory import INDEXED_FIELDS, invalidate_directory_on_commit
+from .hierarchy import rebuild_subtrees
+from .visibility import invalidate_projects_on_commit
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, update_fields=None, **kwargs):
+    # Logins save only last_login, which the cached row doesn't hold
+    if update_fields is None or user_cache.cached_fields.intersection(update_fields):
+        user_cache.invalidate_on_commit(instance.pk)
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_directory(sender, instance, update_fields=None, **kwargs):
+    # Logins save with update_fields=['last_login']; don't rebuild the index for those
+    if update_fields is None or INDEXED_FIELDS.intersection(update_fields):
+        invalidate_directory_on_commit()
+
+@receiver(pre_delete, sender=User)
+def remember_direct_reports(sender, instance, **kwargs):
+    instance._direct_report_ids = list(instance.direct_reports.values_list('pk', flat=True))
+
+@receiver(post_delete, sender=User)
+def rebuild_orphaned_reports(sender, instance, **kwargs):
+    # SET_NULL has already detached the direct reports; drop the stale
+    # closure rows that still link them to the deleted user's ancestors.
+    report_ids = getattr(instance, '_direct_report_ids', None)
+    if report_ids:
+        rebuild_subtrees(report_ids)
+
+@receiver(post_save, sender='projects.ProjectMember')
+@receiver(post_delete, sender='projects.ProjectMember')
+def invalidate_member_visibility(sender, instance, **kwargs):
+    invalidate_projects_on_commit([instance.user_id])
+
+@receiver(post_save, sender='projects.Project')
+def invalidate_manager_visibility(sender, instance, created, **kwargs):
+    # Project.save resets the loaded value only after post_save has run
+    previous = instance._loaded_project_manager_id
+    if created or previous != instance.project_manager_id:
+        invalidate_projects_on_commit({previous, instance.project_manager_id})
@@ -0,0 +1,40 @@
+import datetime
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+from .authentication import user_cache
+from .models import User
+
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class MeQueryCountTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        user_cache.clear_local()
+        self.user = User.objects.create_user(
+            'me', 'me@example.com', 'x', first_name='Ada', position='Engineer', phone_number='555-0100',
+            date_of_birth=datetime.date(1990, 1, 1), date_of_joining=datetime.date(2020, 1, 1), is_staff=True,
+        )
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.user)}')
+
+    def test_uncached_user_is_loaded_in_one_query(self):
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/users/me/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['position'], 'Engineer')
+        self.assertEqual(response.data['date_of_joining'], '2020-01-01')
+
+    def test_cached_user_needs_no_queries(self):
+        self.client.get('/api/users/me/')
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/users/me/')
+        self.assertEqual(response.data['phone_number'], '555-0100')
+        self.assertIsNotNone(response.data['created_at'])
+
+        user_cache.clear_local()
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/users/me/')
+        self.assertEqual(response.data['date_of_birth'], '1990-01-01')
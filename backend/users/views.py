@@ -1,27 +1,59 @@
 from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from rest_framework_simplejwt.views import TokenObtainPairView
+from rest_framework.views import APIView
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from django.contrib.auth import get_user_model
-from django.core.mail import send_mail
 from django.conf import settings
 from django.utils.http import urlsafe_base64_encode, urlsafe_base64_decode
 from django.utils.encoding import force_bytes, force_str
 from django.contrib.auth.tokens import default_token_generator
+from django.core.exceptions import ValidationError as DjangoValidationError
+from webtrack_notifications.outbox import queue_mail
+from .authentication import user_cache
+from .directory import autocomplete
+from .hierarchy import reorganize
+from .importers import UserImporter
+from .revocation import revocations
 from .serializers import (
     UserSerializer, UserCreateSerializer, UserUpdateSerializer,
-    ChangePasswordSerializer, PasswordResetSerializer, PasswordResetConfirmSerializer
+    ChangePasswordSerializer, PasswordResetSerializer, PasswordResetConfirmSerializer,
+    LoginSerializer, ReorganizeSerializer, RevocationAwareTokenRefreshSerializer,
+    TokenRevokeSerializer, UserRefMap
 )
 
 User = get_user_model()
 
 class CustomTokenObtainPairView(TokenObtainPairView):
-    def post(self, request, *args, **kwargs):
-        response = super().post(request, *args, **kwargs)
-        if response.status_code == 200:
-            user = User.objects.get(username=request.data['username'])
-            response.data['user'] = UserSerializer(user).data
-        return response
+    serializer_class = LoginSerializer
+
+class CustomTokenRefreshView(TokenRefreshView):
+    serializer_class = RevocationAwareTokenRefreshSerializer
+
+class TokenRevokeView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        serializer = TokenRevokeSerializer(data=request.data)
+        if serializer.is_valid():
+            tokens = [request.auth] if request.auth is not None else []
+            raw_refresh = serializer.validated_data.get('refresh')
+            if raw_refresh:
+                try:
+                    refresh = RefreshToken(raw_refresh)
+                except TokenError as exc:
+                    return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+                if not request.user.is_admin and str(refresh.get(api_settings.USER_ID_CLAIM)) != str(request.user.pk):
+                    return Response({'error': 'Cannot revoke another user\'s token.'}, status=status.HTTP_403_FORBIDDEN)
+                tokens.append(refresh)
+
+            for token in tokens:
+                revocations.revoke(token[api_settings.JTI_CLAIM], token['exp'])
+            return Response({'message': 'Tokens revoked.'})
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 class UserViewSet(viewsets.ModelViewSet):
     queryset = User.objects.all()
@@ -38,7 +70,7 @@ class UserViewSet(viewsets.ModelViewSet):
     def get_permissions(self):
         if self.action in ['create', 'reset_password', 'reset_password_confirm']:
             return [permissions.AllowAny()]
-        elif self.action in ['change_password']:
+        elif self.action in ['change_password', 'autocomplete']:
             return [permissions.IsAuthenticated()]
         return [permissions.IsAdminUser()]
 
@@ -47,6 +79,59 @@ class UserViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(request.user)
         return Response(serializer.data)
 
+    @action(detail=False, methods=['get'])
+    def autocomplete(self, request):
+        query = request.query_params.get('q', '')
+        try:
+            limit = min(int(request.query_params.get('limit', 10)), settings.USER_AUTOCOMPLETE_MAX_RESULTS)
+            if limit < 1:
+                raise ValueError
+        except ValueError:
+            return Response({'error': 'Limit must be a positive integer.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        ref_map = UserRefMap(request)
+        return Response([ref_map.build(row) for row in autocomplete(query, limit)])
+
+    @action(detail=False, methods=['post'])
+    def bulk_import(self, request):
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({'error': 'A CSV or NDJSON file is required.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        file_format = request.data.get('file_format') or UserImporter.detect_format(upload.name)
+        if file_format not in UserImporter.formats:
+            return Response({'error': 'File format must be csv or ndjson.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            batch_size = int(request.data.get('batch_size', settings.USER_IMPORT_BATCH_SIZE))
+            if batch_size < 1:
+                raise ValueError
+        except ValueError:
+            return Response({'error': 'Batch size must be a positive integer.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        importer = UserImporter(batch_size=batch_size)
+        result = importer.run(importer.read_rows(upload, file_format))
+        return Response(result)
+
+    @action(detail=False, methods=['post'])
+    def reorg(self, request):
+        serializer = ReorganizeSerializer(data=request.data)
+        if serializer.is_valid():
+            assignments = {
+                item['user']: item['manager']
+                for item in serializer.validated_data['assignments']
+            }
+            try:
+                moved = reorganize(assignments)
+            except DjangoValidationError as exc:
+                return Response({'error': exc.messages}, status=status.HTTP_400_BAD_REQUEST)
+            return Response({'moved': moved})
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    @action(detail=False, methods=['get'])
+    def auth_cache_stats(self, request):
+        return Response(user_cache.stats())
+
     @action(detail=False, methods=['post'])
     def change_password(self, request):
         serializer = ChangePasswordSerializer(data=request.data)
@@ -69,12 +154,11 @@ class UserViewSet(viewsets.ModelViewSet):
                 token = default_token_generator.make_token(user)
                 reset_url = f"{settings.FRONTEND_URL}/reset-password/{uid}/{token}"
 
-                send_mail(
+                queue_mail(
                     'Password Reset Requested',
                     f'Click the following link to reset your password: {reset_url}',
                     settings.DEFAULT_FROM_EMAIL,
                     [user.email],
-                    fail_silently=False,
                 )
                 return Response({'message': 'Password reset email sent.'})
             return Response({'error': 'User not found.'}, status=status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,95 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from .models import ReportingLine
+
+GENERATION_KEY = 'visibility:hierarchy-generation'
+
+def _timeout():
+    return getattr(settings, 'VISIBILITY_CACHE_TIMEOUT', 600)
+
+def _hierarchy_generation():
+    return cache.get_or_set(GENERATION_KEY, 1, None)
+
+def invalidate_hierarchy():
+    """Any re-org can change many managers' report sets, so bump a shared generation."""
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.set(GENERATION_KEY, 1, None)
+
+def invalidate_projects(user_ids):
+    cache.delete_many([f'visibility:projects:{user_id}' for user_id in user_ids if user_id is not None])
+
+class Visibility:
+    """
+    Precomputed sets of employee and project IDs a user may see. Sets are
+    cached per user and turned into plain id__in predicates, replacing the
+    OR-across-joins plus DISTINCT querysets in the role-scoped viewsets.
+    """
+
+    def __init__(self, user):
+        self.user = user
+        self._report_ids = None
+        self._projects = None
+
+    @property
+    def report_ids(self):
+        if self._report_ids is None:
+            key = f'visibility:reports:{_hierarchy_generation()}:{self.user.pk}'
+            report_ids = cache.get(key)
+            if report_ids is None:
+                report_ids = list(
+                    ReportingLine.objects.filter(ancestor=self.user).values_list('descendant_id', flat=True)
+                )
+                cache.set(key, report_ids, _timeout())
+            self._report_ids = report_ids
+        return self._report_ids
+
+    @property
+    def employee_ids(self):
+        return [self.user.pk] + self.report_ids
+
+    def filter_employees(self, queryset, field='employee'):
+        """Admins see every row, managers their reports' rows, everyone else their own."""
+        if self.user.is_admin:
+            return queryset
+        if self.user.is_manager:
+            return queryset.filter(**{f'{field}_id__in': self.report_ids})
+        return queryset.filter(**{field: self.user})
+
+    def _load_projects(self):
+        if self._projects is None:
+            from projects.models import Project, ProjectMember
+
+            key = f'visibility:projects:{self.user.pk}'
+            projects = cache.get(key)
+            if projects is None:
+                projects = {
+                    'managed': list(Project.objects.filter(project_manager=self.user).values_list('id', flat=True)),
+                    'member': list(ProjectMember.objects.filter(user=self.user).values_list('project_id', flat=True)),
+                }
+                cache.set(key, projects, _timeout())
+            self._projects = projects
+        return self._projects
+
+    @property
+    def managed_project_ids(self):
+        return self._load_projects()['managed']
+
+    @property
+    def project_ids(self):
+        projects = self._load_projects()
+        return sorted(set(projects['managed']) | set(projects['member']))
+
+def get_visibility(user):
+    """Returns the Visibility for user, memoized on the user instance for the request."""
+    visibility = getattr(user, '_visibility', None)
+    if visibility is None:
+        visibility = Visibility(user)
+        user._visibility = visibility
+    return visibility
+
+def invalidate_projects_on_commit(user_ids):
+    user_ids = list(user_ids)
+    transaction.on_commit(lambda: invalidate_projects(user_ids))
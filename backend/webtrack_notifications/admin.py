@@ -1,3 +1,10 @@
 from django.contrib import admin
+from .models import OutboundEmail
 
-# Register your models here.
+@admin.register(OutboundEmail)
+class OutboundEmailAdmin(admin.ModelAdmin):
+    list_display = ('subject', 'status', 'attempts', 'next_attempt_at', 'sent_at', 'created_at')
+    list_filter = ('status',)
+    search_fields = ('subject', 'to')
+    readonly_fields = ('created_at', 'updated_at', 'sent_at')
+    ordering = ('-created_at',)
@@ -0,0 +1,32 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from webtrack_notifications.outbox import OutboxSender, outbox_stats
+
+class Command(BaseCommand):
+    help = (
+        'Deliver queued outbound emails over a persistent SMTP connection. '
+        'Point EMAIL_HOST/EMAIL_PORT at a local SMTP stand-in '
+        '(e.g. python -m aiosmtpd -n -l localhost:1025) to test delivery.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Drain the queue once and exit.')
+        parser.add_argument('--interval', type=float, default=settings.OUTBOX_POLL_INTERVAL)
+        parser.add_argument('--batch-size', type=int, default=settings.OUTBOX_BATCH_SIZE)
+        parser.add_argument('--max-attempts', type=int, default=settings.OUTBOX_MAX_ATTEMPTS)
+
+    def handle(self, *args, **options):
+        sender = OutboxSender(
+            batch_size=options['batch_size'],
+            max_attempts=options['max_attempts'],
+            backoff=settings.OUTBOX_RETRY_BACKOFF,
+        )
+        if options['once']:
+            try:
+                sent = sender.run_once()
+            finally:
+                sender.close()
+            self.stdout.write(self.style.SUCCESS(f'Sent {sent} emails. {outbox_stats()}'))
+        else:
+            self.stdout.write('Outbox sender started.')
+            sender.run_forever(interval=options['interval'])
@@ -0,0 +1,146 @@
+import logging
+import smtplib
+import time
+from datetime import timedelta
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import Avg, Count, F, Q
+from django.utils import timezone
+from .models import OutboundEmail
+
+logger = logging.getLogger(__name__)
+
+def queue_mail(subject, message, from_email, recipient_list):
+    """Drop-in replacement for send_mail that defers delivery to the outbox sender."""
+    return OutboundEmail.objects.create(
+        subject=subject,
+        body=message,
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+        to=list(recipient_list),
+    )
+
+def outbox_stats():
+    since = timezone.now() - timedelta(hours=1)
+    stats = OutboundEmail.objects.aggregate(
+        queued=Count('id', filter=Q(status=OutboundEmail.Status.QUEUED)),
+        failed=Count('id', filter=Q(status=OutboundEmail.Status.FAILED)),
+        sent_last_hour=Count('id', filter=Q(status=OutboundEmail.Status.SENT, sent_at__gte=since)),
+        avg_latency=Avg(F('sent_at') - F('created_at'), filter=Q(status=OutboundEmail.Status.SENT, sent_at__gte=since)),
+    )
+    latency = stats.pop('avg_latency')
+    stats['avg_latency_seconds'] = latency.total_seconds() if latency is not None else None
+    return stats
+
+class OutboxSender:
+    """
+    Delivers queued OutboundEmail rows in batches over a single SMTP
+    connection that is kept open between batches. Failed messages are
+    retried with exponential backoff until max_attempts is reached.
+    """
+
+    def __init__(self, batch_size=100, max_attempts=5, backoff=30, lease=300):
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.lease = lease
+        self.connection = None
+
+    def claim_batch(self):
+        # Push next_attempt_at out by the lease so concurrent senders skip these
+        # rows; if this sender dies mid-batch they become due again afterwards.
+        with transaction.atomic():
+            messages = list(
+                OutboundEmail.objects.due()
+                .select_for_update(skip_locked=True)
+                .order_by('next_attempt_at')[:self.batch_size]
+            )
+            OutboundEmail.objects.filter(pk__in=[message.pk for message in messages]).update(
+                next_attempt_at=timezone.now() + timedelta(seconds=self.lease)
+            )
+        return messages
+
+    def get_connection(self):
+        if self.connection is None:
+            self.connection = get_connection(fail_silently=False)
+            self.connection.open()
+        return self.connection
+
+    def close(self):
+        if self.connection is not None:
+            try:
+                self.connection.close()
+            finally:
+                self.connection = None
+
+    def mark_failed(self, message, error):
+        attempts = message.attempts + 1
+        if attempts >= self.max_attempts:
+            status, next_attempt_at = OutboundEmail.Status.FAILED, message.next_attempt_at
+        else:
+            status = OutboundEmail.Status.QUEUED
+            next_attempt_at = timezone.now() + timedelta(seconds=self.backoff * 2 ** (attempts - 1))
+        OutboundEmail.objects.filter(pk=message.pk).update(
+            status=status,
+            attempts=attempts,
+            last_error=str(error),
+            next_attempt_at=next_attempt_at,
+            updated_at=timezone.now(),
+        )
+        logger.warning('Outbox delivery of %s failed (attempt %s): %s', message.pk, attempts, error)
+
+    def send_batch(self, messages):
+        sent = []
+        try:
+            for message in messages:
+                started = time.perf_counter()
+                try:
+                    email = EmailMessage(message.subject, message.body, message.from_email, message.to)
+                    self.get_connection().send_messages([email])
+                except smtplib.SMTPServerDisconnected as exc:
+                    # The connection itself is gone; reopen it for the next message.
+                    self.close()
+                    self.mark_failed(message, exc)
+                except smtplib.SMTPException as exc:
+                    # Refused recipient, rejected data etc.: the connection is still usable.
+                    self.mark_failed(message, exc)
+                except OSError as exc:
+                    # Socket-level failure (SMTPException subclasses OSError, so this comes after it)
+                    self.close()
+                    self.mark_failed(message, exc)
+                except Exception as exc:
+                    # e.g. BadHeaderError or an encoding error in this message alone
+                    self.mark_failed(message, exc)
+                else:
+                    sent.append(message.pk)
+                    logger.info('Outbox delivered %s in %.1f ms', message.pk, (time.perf_counter() - started) * 1000)
+        finally:
+            # Record deliveries even if the loop is interrupted, so they are not resent after the lease
+            if sent:
+                now = timezone.now()
+                OutboundEmail.objects.filter(pk__in=sent).update(
+                    status=OutboundEmail.Status.SENT,
+                    attempts=F('attempts') + 1,
+                    last_error='',
+                    sent_at=now,
+                    updated_at=now,
+                )
+        return len(sent)
+
+    def run_once(self):
+        sent = 0
+        while True:
+            messages = self.claim_batch()
+            if not messages:
+                return sent
+            sent += self.send_batch(messages)
+
+    def run_forever(self, interval=5):
+        try:
+            while True:
+                if not self.run_once():
+                    # Idle: drop the SMTP connection instead of letting the server time it out.
+                    self.close()
+                    time.sleep(interval)
+        finally:
+            self.close()
@@ -1,3 +1,85 @@
-from django.test import TestCase
+import smtplib
+from datetime import timedelta
+from io import StringIO
+from django.core import mail
+from django.core.mail.backends import locmem
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from .models import OutboundEmail
+from .outbox import OutboxSender, queue_mail
 
-# Create your tests here.
+class FlakyBackend(locmem.EmailBackend):
+    """Local SMTP stand-in: refuses refused@example.com and drops the connection on drop@example.com."""
+    opened = 0
+
+    def open(self):
+        FlakyBackend.opened += 1
+        return super().open()
+
+    def send_messages(self, messages):
+        for message in messages:
+            if 'refused@example.com' in message.to:
+                raise smtplib.SMTPRecipientsRefused({'refused@example.com': (550, b'No such user')})
+            if 'drop@example.com' in message.to:
+                raise smtplib.SMTPServerDisconnected('Connection unexpectedly closed')
+        return super().send_messages(messages)
+
+class SendOutboxTests(TestCase):
+    def test_send_outbox_drains_the_queue(self):
+        for i in range(3):
+            queue_mail(f'Subject {i}', 'Body', None, [f'user{i}@example.com'])
+
+        call_command('send_outbox', '--once', stdout=StringIO())
+
+        self.assertEqual(sorted(message.subject for message in mail.outbox), ['Subject 0', 'Subject 1', 'Subject 2'])
+        for email in OutboundEmail.objects.all():
+            self.assertEqual(email.status, OutboundEmail.Status.SENT)
+            self.assertEqual(email.attempts, 1)
+            self.assertIsNotNone(email.sent_at)
+        self.assertFalse(OutboundEmail.objects.due().exists())
+
+@override_settings(EMAIL_BACKEND='webtrack_notifications.tests.FlakyBackend')
+class OutboxRetryTests(TestCase):
+    def setUp(self):
+        FlakyBackend.opened = 0
+        self.sender = OutboxSender(max_attempts=2, backoff=30)
+
+    def tearDown(self):
+        self.sender.close()
+
+    def test_refused_message_is_retried_with_backoff_then_failed(self):
+        good = queue_mail('Good', 'Body', None, ['user@example.com'])
+        refused = queue_mail('Refused', 'Body', None, ['refused@example.com'])
+
+        before = timezone.now()
+        self.assertEqual(self.sender.run_once(), 1)
+        good.refresh_from_db()
+        refused.refresh_from_db()
+        self.assertEqual(good.status, OutboundEmail.Status.SENT)
+        self.assertEqual(refused.status, OutboundEmail.Status.QUEUED)
+        self.assertEqual(refused.attempts, 1)
+        self.assertIn('No such user', refused.last_error)
+        self.assertGreaterEqual(refused.next_attempt_at, before + timedelta(seconds=30))
+
+        # Not due until the backoff has passed
+        self.assertEqual(self.sender.run_once(), 0)
+        self.assertEqual(OutboundEmail.objects.get(pk=refused.pk).attempts, 1)
+
+        OutboundEmail.objects.filter(pk=refused.pk).update(next_attempt_at=timezone.now())
+        self.assertEqual(self.sender.run_once(), 0)
+        refused.refresh_from_db()
+        self.assertEqual(refused.status, OutboundEmail.Status.FAILED)
+        self.assertEqual(refused.attempts, 2)
+        self.assertEqual([message.subject for message in mail.outbox], ['Good'])
+
+    def test_dropped_connection_is_reopened_for_the_rest_of_the_batch(self):
+        dropped = queue_mail('Dropped', 'Body', None, ['drop@example.com'])
+        queue_mail('After', 'Body', None, ['user@example.com'])
+
+        self.assertEqual(self.sender.run_once(), 1)
+        dropped.refresh_from_db()
+        self.assertEqual(dropped.status, OutboundEmail.Status.QUEUED)
+        self.assertEqual(dropped.attempts, 1)
+        self.assertEqual([message.subject for message in mail.outbox], ['After'])
+        self.assertEqual(FlakyBackend.opened, 2)
@@ -4,5 +4,5 @@ from . import views
 app_name = 'webtrack_notifications'
 
 urlpatterns = [
-    # URLs will be added here
+    path('outbox/stats/', views.OutboxStatsView.as_view(), name='outbox-stats'),
 ]
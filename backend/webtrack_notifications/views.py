@@ -1,3 +1,10 @@
-from django.shortcuts import render
+from rest_framework import permissions
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from .outbox import outbox_stats
 
-# Create your views here.
+class OutboxStatsView(APIView):
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        return Response(outbox_stats())